@@ -110,7 +110,9 @@ if DATABASE_URL:
     DATABASES = {
         'default': dj_database_url.config(
             default=DATABASE_URL,
-            conn_max_age=600,
+            conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', '600')),
+            # Ping reused connections so a server-side disconnect doesn't fail the next request
+            conn_health_checks=True,
             ssl_require=True
         )
     }
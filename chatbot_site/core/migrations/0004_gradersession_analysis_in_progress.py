@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_discussionsession_concept_cluster_html_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gradersession',
+            name='analysis_in_progress',
+            field=models.BooleanField(default=False, help_text='Set while a background analysis is running'),
+        ),
+    ]
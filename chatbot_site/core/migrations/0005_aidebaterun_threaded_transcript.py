@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-15 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_gradersession_analysis_in_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aidebaterun',
+            name='threaded_transcript',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
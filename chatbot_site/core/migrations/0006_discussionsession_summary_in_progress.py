@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-15 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_aidebaterun_threaded_transcript'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='discussionsession',
+            name='summary_in_progress',
+            field=models.BooleanField(default=False, help_text='Set while a background moderator summary is running'),
+        ),
+    ]
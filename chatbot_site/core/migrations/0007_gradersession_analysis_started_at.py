@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_discussionsession_summary_in_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gradersession',
+            name='analysis_started_at',
+            field=models.DateTimeField(blank=True, help_text='When the current background analysis started', null=True),
+        ),
+    ]
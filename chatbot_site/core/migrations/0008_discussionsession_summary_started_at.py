@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-16 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_gradersession_analysis_started_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='discussionsession',
+            name='summary_started_at',
+            field=models.DateTimeField(blank=True, help_text='When the current background summary started', null=True),
+        ),
+    ]
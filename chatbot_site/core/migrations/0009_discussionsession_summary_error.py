@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-16 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_discussionsession_summary_started_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='discussionsession',
+            name='summary_error',
+            field=models.TextField(blank=True, help_text='Why the last background summary failed, if it did'),
+        ),
+    ]
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+from datetime import timedelta
+
+from django.core.cache import cache
 from django.db import models
+from django.utils import timezone
+from django.utils.functional import cached_property
 
 # Import prompts from the centralized prompts package
 import sys
@@ -17,12 +22,47 @@ from prompts.prompts import (
 )
 
 
+# A background job (grader analysis, moderator summary) whose flag is still set
+# after this long is assumed to have died with its worker and may be restarted.
+BACKGROUND_JOB_STALE_AFTER = timedelta(minutes=10)
+
+
+def _background_job_running(in_progress: bool, started_at) -> bool:
+    return bool(in_progress and started_at and timezone.now() - started_at < BACKGROUND_JOB_STALE_AFTER)
+
+
+class ActiveSessionCacheMixin:
+    """Remember the active session's pk in Django's cache to skip the active-row scan.
+
+    A cached pk is only trusted if that row is still active, so a session
+    activated in another process (which deactivates every other row) is picked
+    up on the next lookup instead of serving a stale selection.
+    """
+
+    ACTIVE_CACHE_TIMEOUT = 300
+
+    @classmethod
+    def _active_cache_key(cls) -> str:
+        return f"core:active_{cls.__name__}_id"
+
+    @classmethod
+    def _get_cached_active(cls):
+        pk = cache.get(cls._active_cache_key())
+        if pk is None:
+            return None
+        return cls.objects.filter(pk=pk, is_active=True).first()
+
+    @classmethod
+    def _remember_active(cls, pk: int) -> None:
+        cache.set(cls._active_cache_key(), pk, timeout=cls.ACTIVE_CACHE_TIMEOUT)
+
+
 class DiscussionSessionQuerySet(models.QuerySet):
     def active(self) -> "models.QuerySet[DiscussionSession]":
         return self.filter(is_active=True).order_by("-updated_at")
 
 
-class DiscussionSession(models.Model):
+class DiscussionSession(ActiveSessionCacheMixin, models.Model):
     """Represents a full moderator-led discussion workflow (Human-AI deliberation).
     
     Questions are stored in a unified format:
@@ -61,6 +101,9 @@ class DiscussionSession(models.Model):
     moderator_temp = models.TextField(blank=True)
     moderator_summary = models.TextField(blank=True)
     concept_cluster_html = models.TextField(blank=True, help_text="HTML visualization of concept clusters")
+    summary_in_progress = models.BooleanField(default=False, help_text="Set while a background moderator summary is running")
+    summary_started_at = models.DateTimeField(null=True, blank=True, help_text="When the current background summary started")
+    summary_error = models.TextField(blank=True, help_text="Why the last background summary failed, if it did")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -73,6 +116,11 @@ class DiscussionSession(models.Model):
     def __str__(self) -> str:
         return f"DiscussionSession<{self.s_id}>"
 
+    @property
+    def summary_running(self) -> bool:
+        """True while a background summary is flagged and recent enough to still be alive."""
+        return _background_job_running(self.summary_in_progress, self.summary_started_at)
+
     def activate(self) -> None:
         """Mark this session as the active one for incoming users."""
 
@@ -80,14 +128,22 @@ class DiscussionSession(models.Model):
         if not self.is_active:
             self.is_active = True
             self.save(update_fields=["is_active"])
+        type(self)._remember_active(self.pk)
 
     def get_all_questions(self) -> list[dict]:
         """Return the ordered list of all questions with their types.
         
         Returns list of dicts: [{"text": "...", "type": "grading"|"discussion"}, ...]
+        The result is memoized until ``objective_questions`` is reassigned, so
+        callers must treat it as read-only.
         """
+        source = self.objective_questions
+        cached = self.__dict__.get("_all_questions_cache")
+        if cached is not None and cached[0] is source:
+            return cached[1]
+
         questions = []
-        for entry in self.objective_questions or []:
+        for entry in source or []:
             if isinstance(entry, dict):
                 text = str(entry.get("text", "")).strip()
                 qtype = str(entry.get("type", "discussion")).strip().lower()
@@ -100,6 +156,7 @@ class DiscussionSession(models.Model):
                 candidate = entry.strip()
                 if candidate:
                     questions.append({"text": candidate, "type": "discussion"})
+        self._all_questions_cache = (source, questions)
         return questions
 
     def get_question_sequence(self) -> list[str]:
@@ -148,16 +205,17 @@ class DiscussionSession(models.Model):
     def get_active(cls) -> "DiscussionSession":
         """Return the active session, creating a default if needed."""
 
-        session = cls.objects.active().first()
-        if session:
-            return session
-        return cls.objects.create(
-            s_id="default",
-            topic="Default Discussion",
-            objective_questions=[],
-            question_followup_limit=3,
-            no_new_information_limit=2,
-        )
+        session = cls._get_cached_active() or cls.objects.active().first()
+        if session is None:
+            session = cls.objects.create(
+                s_id="default",
+                topic="Default Discussion",
+                objective_questions=[],
+                question_followup_limit=3,
+                no_new_information_limit=2,
+            )
+        cls._remember_active(session.pk)
+        return session
 
 
 class UserConversation(models.Model):
@@ -267,7 +325,7 @@ class UserConversation(models.Model):
         return f"UserConversation<session={self.session_id}, user={self.user_id}>"
 
 
-class AIDeliberationSession(models.Model):
+class AIDeliberationSession(ActiveSessionCacheMixin, models.Model):
     """Represents an AI-only deliberation session (AI-AI debate)."""
 
     s_id = models.CharField(max_length=64, unique=True)
@@ -323,15 +381,16 @@ class AIDeliberationSession(models.Model):
     @classmethod
     def get_active(cls) -> "AIDeliberationSession":
         """Return the active AI session, creating a default if needed."""
-        session = cls.objects.filter(is_active=True).order_by("-updated_at").first()
-        if session:
-            return session
-        return cls.objects.create(
-            s_id="ai-default",
-            topic="Default AI Deliberation",
-            objective_questions=[],
-            personas=[],
-        )
+        session = cls._get_cached_active() or cls.objects.filter(is_active=True).order_by("-updated_at").first()
+        if session is None:
+            session = cls.objects.create(
+                s_id="ai-default",
+                topic="Default AI Deliberation",
+                objective_questions=[],
+                personas=[],
+            )
+        cls._remember_active(session.pk)
+        return session
 
     def activate(self) -> None:
         """Mark this session as the active one."""
@@ -339,6 +398,7 @@ class AIDeliberationSession(models.Model):
         if not self.is_active:
             self.is_active = True
             self.save(update_fields=["is_active"])
+        type(self)._remember_active(self.pk)
 
 
 class AIDebateRun(models.Model):
@@ -351,6 +411,8 @@ class AIDebateRun(models.Model):
     )
     # Debate transcript: list of turns with {question, persona, opinion, summary}
     transcript = models.JSONField(default=list, blank=True)
+    # Transcript grouped per question for the results page, built once when the run finishes
+    threaded_transcript = models.JSONField(default=list, blank=True)
     completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -385,7 +447,7 @@ class AIDebateSummary(models.Model):
         return f"AIDebateSummary<session={self.session_id}>"
 
 
-class GraderSession(models.Model):
+class GraderSession(ActiveSessionCacheMixin, models.Model):
     """Represents a grader-style session where participants assign numeric scores to objective questions."""
 
     s_id = models.CharField(max_length=64, unique=True)
@@ -399,6 +461,8 @@ class GraderSession(models.Model):
     rag_last_built_at = models.DateTimeField(null=True, blank=True)
     user_instructions = models.TextField(blank=True, help_text="Optional moderator-provided instructions for graders")
     analysis_markdown = models.TextField(blank=True, help_text="LLM-generated analysis of collected grader feedback")
+    analysis_in_progress = models.BooleanField(default=False, help_text="Set while a background analysis is running")
+    analysis_started_at = models.DateTimeField(null=True, blank=True, help_text="When the current background analysis started")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -409,7 +473,9 @@ class GraderSession(models.Model):
     def __str__(self) -> str:
         return f"GraderSession<{self.s_id}>"
 
-    def get_question_sequence(self) -> list[str]:
+    @cached_property
+    def question_sequence(self) -> list[str]:
+        """Cleaned question texts, computed once per instance."""
         questions = []
         for entry in self.objective_questions or []:
             if isinstance(entry, str):
@@ -420,18 +486,32 @@ class GraderSession(models.Model):
                 questions.append(candidate)
         return questions
 
+    def get_question_sequence(self) -> list[str]:
+        return list(self.question_sequence)
+
+    @property
+    def analysis_running(self) -> bool:
+        """True while a background analysis is flagged and recent enough to still be alive."""
+        return _background_job_running(self.analysis_in_progress, self.analysis_started_at)
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        self.__dict__.pop("question_sequence", None)
+        super().refresh_from_db(*args, **kwargs)
+
     @classmethod
     def get_active(cls) -> "GraderSession":
-        session = cls.objects.filter(is_active=True).order_by("-updated_at").first()
-        if session:
-            return session
-        return cls.objects.create(s_id="grader-default", topic="Default Grader Session", objective_questions=[])
+        session = cls._get_cached_active() or cls.objects.filter(is_active=True).order_by("-updated_at").first()
+        if session is None:
+            session = cls.objects.create(s_id="grader-default", topic="Default Grader Session", objective_questions=[])
+        cls._remember_active(session.pk)
+        return session
 
     def activate(self) -> None:
         type(self).objects.exclude(pk=self.pk).update(is_active=False)
         if not self.is_active:
             self.is_active = True
             self.save(update_fields=["is_active"]) 
+        type(self)._remember_active(self.pk)
 
 
 class GraderResponse(models.Model):
@@ -22,6 +22,39 @@ def estimate_tokens(text: str) -> int:
     return max(1, int(len(text) * TOKENS_PER_CHAR))
 
 
+# Legacy transcripts record a round number instead of a stage
+_ROUND_STAGES = {1: "initial", 2: "critique"}
+_STAGE_LABELS = {"initial": "Initial Response", "critique": "Critique"}
+
+
+def build_transcript_threads(transcript: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Group transcript turns into one chat-like thread per question, in first-seen order."""
+
+    thread_lookup: Dict[int, Dict[str, object]] = {}
+    for turn in transcript:
+        q_idx = int(turn.get("question_index", 0))
+        thread = thread_lookup.get(q_idx)
+        if thread is None:
+            thread = thread_lookup[q_idx] = {
+                "question_index": q_idx,
+                "question": turn.get("question", ""),
+                "messages": [],
+            }
+
+        stage = turn.get("stage") or _ROUND_STAGES.get(turn.get("round"))
+        thread["messages"].append(
+            {
+                "persona": turn.get("persona", ""),
+                "content": turn.get("content") or turn.get("opinion", ""),
+                "stage": stage,
+                "stage_label": _STAGE_LABELS.get(stage),
+                "peer_opinions": turn.get("peer_opinions", []),
+            }
+        )
+
+    return list(thread_lookup.values())
+
+
 class AIDeliberationService:
     """Orchestrates the AI-only debate workflow."""
 
@@ -88,8 +121,9 @@ class AIDeliberationService:
         try:
             transcript = self._execute_debate()
             run.transcript = transcript
+            run.threaded_transcript = build_transcript_threads(transcript)
             run.completed = True
-            run.save(update_fields=["transcript", "completed", "updated_at"])
+            run.save(update_fields=["transcript", "threaded_transcript", "completed", "updated_at"])
         except Exception as exc:  # pragma: no cover - defensive
             self.logger.exception("AI deliberation failed for session %s", self.session.pk)
             run.transcript = [
@@ -99,8 +133,9 @@ class AIDeliberationService:
                     "content": f"Deliberation failed: {exc}",
                 }
             ]
+            run.threaded_transcript = build_transcript_threads(run.transcript)
             run.completed = True
-            run.save(update_fields=["transcript", "completed", "updated_at"])
+            run.save(update_fields=["transcript", "threaded_transcript", "completed", "updated_at"])
 
     def _execute_debate(self) -> List[Dict[str, object]]:
         """Run the debate workflow and return the transcript payload."""
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import json
+import logging
 import sys
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
 
 from django.conf import settings
+from django.db import close_old_connections
 from django.utils import timezone
 
 from .openai_client import get_openai_client
@@ -468,12 +471,12 @@ class UserConversationService:
         if self.conversation.active:
             self.conversation.active = False
             self.conversation.termination_reason = "manual"
-            self.conversation.save(update_fields=["active", "termination_reason"])
+            self.conversation.save(update_fields=["active", "termination_reason", "updated_at"])
 
         final_views = self.conversation.views_markdown or self._finalize_from_temp()
 
         self.conversation.views_markdown = final_views
-        self.conversation.save(update_fields=["views_markdown", "unique_concepts", "content_length"])
+        self.conversation.save(update_fields=["views_markdown", "unique_concepts", "content_length", "updated_at"])
         return final_views
 
 
@@ -484,6 +487,73 @@ class ModeratorAnalysisService:
         self.session = session
         self.client = get_openai_client()
 
+    def start_summary(self, blocking: bool = False) -> None:
+        """Kick off the moderator summary and concept clustering.
+
+        Args:
+            blocking: When True, execute synchronously (useful for tests).
+                      When False, the summary executes in a background thread
+                      and ``summary_in_progress`` stays set until it finishes.
+                      If the worker dies first, ``summary_started_at`` lets the
+                      dashboard treat the run as stale and start a new one.
+        """
+
+        self.session.summary_in_progress = True
+        self.session.summary_started_at = timezone.now()
+        self.session.summary_error = ""
+        self.session.save(update_fields=["summary_in_progress", "summary_started_at", "summary_error", "updated_at"])
+
+        if blocking:
+            self._summarize_and_store()
+        else:
+            thread = threading.Thread(
+                target=self._summarize_and_store_thread,
+                daemon=True,
+            )
+            thread.start()
+
+    def _summarize_and_store_thread(self) -> None:
+        """Worker entry point for the background thread."""
+
+        close_old_connections()
+        try:
+            self._summarize_and_store()
+        finally:
+            close_old_connections()
+
+    def _summarize_and_store(self) -> None:
+        """Generate the summary, then clear the in-progress flag.
+
+        Failures are kept in ``summary_error`` so the dashboard can tell the
+        moderator the run failed rather than showing the previous summary as new.
+        """
+
+        error = ""
+        try:
+            if self.generate_summary() is None:
+                error = "No user view documents found yet."
+        except Exception as exc:  # pragma: no cover - defensive
+            logging.getLogger(__name__).exception(
+                "Moderator summary failed for session %s", self.session.pk
+            )
+            error = f"Summary failed: {exc}"
+        # Bumping updated_at also invalidates cached copies of the session exports
+        self.session.summary_in_progress = False
+        self.session.summary_error = error
+        self.session.save(update_fields=["summary_in_progress", "summary_error", "updated_at"])
+
+    def has_user_views(self) -> bool:
+        """Return True when :meth:`_collect_user_views` would find anything to summarize."""
+
+        conversations = self.session.conversations
+        if conversations.filter(views_markdown__gt="").exists():
+            return True
+        return any(
+            response.get("question_type") == "grading"
+            for responses in conversations.values_list("responses", flat=True).iterator()
+            for response in responses or []
+        )
+
     def _collect_user_views(self) -> List[Dict[str, str]]:
         views: List[Dict[str, str]] = []
         for conversation in self.session.conversations.filter(views_markdown__gt=""):
@@ -557,7 +627,7 @@ class ModeratorAnalysisService:
 
         self.session.moderator_temp = moderator_temp
         self.session.moderator_summary = moderator_summary
-        self.session.save(update_fields=["moderator_temp", "moderator_summary"])
+        self.session.save(update_fields=["moderator_temp", "moderator_summary", "updated_at"])
         
         # Generate concept clustering visualization
         self.generate_concept_clusters()
@@ -571,7 +641,7 @@ class ModeratorAnalysisService:
             clustering_service = ConceptClusteringService(self.session)
             concept_viz_html = clustering_service.generate_network_visualization()
             self.session.concept_cluster_html = concept_viz_html
-            self.session.save(update_fields=["concept_cluster_html"])
+            self.session.save(update_fields=["concept_cluster_html", "updated_at"])
         except Exception as exc:  # pragma: no cover - defensive
             # Log error but don't fail the entire analysis
             import logging
@@ -0,0 +1,211 @@
+"""Service for summarizing collected grader feedback."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Set
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Avg, FloatField
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from .openai_client import get_openai_client
+from ..models import GraderResponse, GraderSession
+
+# Upper bound on concurrent per-question summary requests to the LLM
+MAX_SUMMARY_WORKERS = 16
+# Characters of grader reasons sent to the LLM per question
+COMMENT_CHAR_BUDGET = 4000
+
+
+def _take_budget(strings: List[str], budget: int = COMMENT_CHAR_BUDGET, sep: str = "\n\n") -> str:
+    """Join ``strings`` with ``sep``, stopping once ``budget`` characters are used.
+
+    Equivalent to ``sep.join(strings)[:budget]`` without building the full
+    concatenation first.
+    """
+
+    parts: List[str] = []
+    used = 0
+    for index, text in enumerate(strings):
+        for piece in ((sep, text) if index else (text,)):
+            remaining = budget - used
+            if len(piece) >= remaining:
+                parts.append(piece[:remaining])
+                return "".join(parts)
+            parts.append(piece)
+            used += len(piece)
+    return "".join(parts)
+
+
+class GraderAnalysisService:
+    """Computes per-question averages and LLM summaries for a grader session."""
+
+    def __init__(self, session: GraderSession) -> None:
+        self.session = session
+        self.client = get_openai_client()
+        self.logger = logging.getLogger(__name__)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def start_analysis(self, blocking: bool = False) -> None:
+        """Kick off an analysis of the session's grader responses.
+
+        Args:
+            blocking: When True, execute synchronously (useful for tests).
+                      When False, the analysis executes in a background thread
+                      and ``analysis_in_progress`` stays set until it finishes.
+                      If the worker dies first, ``analysis_started_at`` lets the
+                      dashboard treat the run as stale and start a new one.
+        """
+
+        self.session.analysis_in_progress = True
+        self.session.analysis_started_at = timezone.now()
+        self.session.save(update_fields=["analysis_in_progress", "analysis_started_at", "updated_at"])
+
+        if blocking:
+            self._analyze_and_store()
+        else:
+            thread = threading.Thread(
+                target=self._analyze_and_store_thread,
+                daemon=True,
+            )
+            thread.start()
+
+    # ------------------------------------------------------------------
+    # Execution helpers
+    # ------------------------------------------------------------------
+
+    def _analyze_and_store_thread(self) -> None:
+        """Worker entry point for the background thread."""
+
+        close_old_connections()
+        try:
+            self._analyze_and_store()
+        finally:
+            close_old_connections()
+
+    def _analyze_and_store(self) -> None:
+        """Run the analysis and persist the markdown, clearing the in-progress flag."""
+
+        try:
+            analysis = self._build_analysis()
+        except Exception as exc:  # pragma: no cover - defensive
+            self.logger.exception("Grader analysis failed for session %s", self.session.pk)
+            analysis = f"# Analysis for {self.session.topic}\n\nAnalysis failed: {exc}\n"
+
+        self.session.analysis_markdown = analysis
+        self.session.analysis_in_progress = False
+        self.session.save(update_fields=["analysis_markdown", "analysis_in_progress", "updated_at"])
+
+    def _build_analysis(self) -> str:
+        """Compute average scores and summarize reasons per question as markdown."""
+
+        questions = self.session.question_sequence
+        question_count = len(questions)
+
+        responses = GraderResponse.objects.filter(session=self.session)
+
+        # Average each score column in the database; scores are stored as a JSON
+        # array aligned with the questions and unanswered entries are null.
+        averages: List[Optional[float]] = [None] * question_count
+        if question_count:
+            aggregates = responses.aggregate(
+                **{
+                    f"avg_{i}": Avg(Cast(KeyTextTransform(str(i), "scores"), FloatField()))
+                    for i in range(question_count)
+                }
+            )
+            averages = [aggregates[f"avg_{i}"] for i in range(question_count)]
+
+        # Only the reasons column is needed in Python, so no model instances are built.
+        comments_by_q: List[List[str]] = [[] for _ in questions]
+        comment_chars = [0] * question_count
+        # Repeated reasons ("N/A", "good") would only crowd out distinct ones, so
+        # each question keeps the first of every case/whitespace-insensitive variant.
+        seen_by_q: List[Set[str]] = [set() for _ in questions]
+        for reasons in responses.values_list("reasons", flat=True).iterator(chunk_size=500):
+            for i, value in enumerate((reasons or [])[:question_count]):
+                # Reasons past the prompt budget would be cut off anyway
+                if comment_chars[i] >= COMMENT_CHAR_BUDGET:
+                    continue
+                reason = str(value).strip()
+                if not reason:
+                    continue
+                fingerprint = " ".join(reason.split()).casefold()
+                if fingerprint in seen_by_q[i]:
+                    continue
+                seen_by_q[i].add(fingerprint)
+                comments_by_q[i].append(reason)
+                comment_chars[i] += len(reason) + 2
+
+        # Summaries are independent network calls, so issue them concurrently and
+        # publish the partial analysis each time one finishes so the dashboard can
+        # show progress while the rest are still running.
+        summary_texts: List[Optional[str]] = [None] * question_count
+        if questions:
+            with ThreadPoolExecutor(max_workers=min(MAX_SUMMARY_WORKERS, question_count)) as executor:
+                futures = {
+                    executor.submit(self._summarize_question, q, comments_by_q[idx]): idx
+                    for idx, q in enumerate(questions)
+                }
+                for future in as_completed(futures):
+                    summary_texts[futures[future]] = future.result()
+                    if any(text is None for text in summary_texts):
+                        self._publish_partial(self._render_markdown(questions, averages, summary_texts))
+
+        return self._render_markdown(questions, averages, summary_texts)
+
+    def _render_markdown(
+        self,
+        questions: List[str],
+        averages: List[Optional[float]],
+        summary_texts: List[Optional[str]],
+    ) -> str:
+        md_lines = [f"# Analysis for {self.session.topic}\n"]
+        for idx, q in enumerate(questions):
+            avg = averages[idx]
+            avg_str = f"{avg:.2f}" if avg is not None else "No scores"
+            summary = summary_texts[idx]
+            md_lines.append(f"## Question {idx+1}: {q}\n")
+            md_lines.append(f"**Average score:** {avg_str}\n")
+            md_lines.append(f"**Summary of reasons:**\n{summary if summary is not None else '_Summarizing..._'}\n")
+
+        return "\n".join(md_lines)
+
+    def _publish_partial(self, markdown: str) -> None:
+        """Persist an in-progress analysis without touching the in-memory session."""
+
+        GraderSession.objects.filter(pk=self.session.pk).update(analysis_markdown=markdown)
+
+    def _summarize_question(self, question: str, comments: List[str]) -> str:
+        """Ask the LLM for a short summary of the reasons given for one question."""
+
+        concat = _take_budget(comments)
+        system_prompt = "You are summarizing grader feedback for a specific feature/question. Produce a concise markdown summary of the reasons provided by graders."
+        user_prompt = f"Question: {question}\n\nResponses:\n{concat}\n\nProvide a short summary (3-6 sentences) capturing common themes and representative points."
+
+        # Inject moderator's LLM instructions if provided
+        if self.session.user_instructions:
+            user_prompt += f"\n\nModerator instructions: {self.session.user_instructions}"
+
+        messages_payload = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+        try:
+            completion = self.client.chat.completions.create(
+                model=settings.OPENAI_MODEL_NAME,
+                messages=messages_payload,
+                temperature=0.6,
+            )
+            return completion.choices[0].message.content or ""
+        except Exception as exc:
+            return f"(LLM summary failed: {exc})"
@@ -1,14 +1,68 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import threading
+import weakref
 from functools import lru_cache
 
+import httpx
 from django.conf import settings
 
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+# Keep-alive pool shared by every synchronous OpenAI call in the process so
+# TCP/TLS sessions to the API are reused instead of renegotiated per request.
+# The keep-alive size leaves room for GraderAnalysisService's concurrent
+# per-question summaries (MAX_SUMMARY_WORKERS) alongside regular traffic.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+
+_http_client_lock = threading.Lock()
+_shared_http_client: httpx.Client | None = None
+
+
+def _get_shared_http_client() -> httpx.Client:
+    global _shared_http_client
+    if _shared_http_client is None:
+        with _http_client_lock:
+            if _shared_http_client is None:
+                _shared_http_client = DefaultHttpxClient(limits=_HTTP_LIMITS, http2=True)
+                atexit.register(_shared_http_client.close)
+    return _shared_http_client
 
 
 @lru_cache(maxsize=1)
 def get_openai_client() -> OpenAI:
     """Return a cached OpenAI client configured for the project."""
 
-    return OpenAI(api_key=settings.OPENAI_API_KEY)
+    return OpenAI(api_key=settings.OPENAI_API_KEY, http_client=_get_shared_http_client())
+
+
+# The async client's pooled connections are bound to the event loop that opened
+# them. Under the ASGI worker there is one loop per process, but WSGI (and
+# ``runserver``) runs each async view through ``async_to_sync`` on a fresh loop,
+# so the client is rebuilt whenever the running loop changes. Only the loop is
+# held weakly; a client left behind by a finished loop is simply dropped.
+_async_client_lock = threading.Lock()
+_async_client_loop: weakref.ReferenceType[asyncio.AbstractEventLoop] | None = None
+_async_client: AsyncOpenAI | None = None
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Return the async OpenAI client for the running event loop.
+
+    It gets its own pool with the same limits and HTTP/2 so concurrent
+    generations multiplex over kept-alive connections like the sync client.
+    Must be called from inside a coroutine.
+    """
+
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    with _async_client_lock:
+        if _async_client is None or _async_client_loop is None or _async_client_loop() is not loop:
+            _async_client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                http_client=DefaultAsyncHttpxClient(limits=_HTTP_LIMITS, http2=True),
+            )
+            _async_client_loop = weakref.ref(loop)
+        return _async_client
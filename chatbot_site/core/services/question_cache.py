@@ -0,0 +1,158 @@
+"""In-process LRU caches for LLM-generated questions and other small payloads."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+
+
+class TTLLRUCache:
+    """Thread-safe LRU cache with a per-entry time-to-live.
+
+    Values are expected to be lists and are copied on the way in and out so
+    callers cannot mutate cached entries.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 900.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, List[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[List[Any]]:
+        """Return the cached value for ``key`` or None on a miss."""
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return list(entry[1])
+
+    def put(self, key: Hashable, value: List[Any]) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry when full."""
+
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, list(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and occupancy for tuning maxsize/ttl."""
+
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+            }
+
+
+QuestionCacheKey = Tuple[str, str, str, Optional[int], Tuple[float, float]]
+
+
+def _timestamp(value) -> float:
+    return value.timestamp() if value is not None else 0.0
+
+
+def session_cache_version(session) -> Tuple[float, float]:
+    """Return ``(updated_at, rag_last_built_at)`` timestamps for cache keys.
+
+    Saving the session or rebuilding its index changes the version, so entries
+    computed from the old knowledge base are no longer looked up.
+    """
+
+    if session is None:
+        return (0.0, 0.0)
+    return (
+        _timestamp(getattr(session, "updated_at", None)),
+        _timestamp(getattr(session, "rag_last_built_at", None)),
+    )
+
+
+def make_question_cache_key(
+    topic: str,
+    question_type: str,
+    existing_questions: Iterable[str],
+    session=None,
+    knowledge_base: str = "",
+) -> QuestionCacheKey:
+    """Build a normalized cache key for a question-generation request.
+
+    Existing questions are order-insensitive and hashed together with any
+    inline knowledge base text so the key stays small. ``session`` contributes
+    its pk and :func:`session_cache_version`.
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\n".join(sorted(existing_questions)).encode("utf-8"))
+    if knowledge_base:
+        digest.update(b"\x00")
+        digest.update(knowledge_base.encode("utf-8"))
+    return (
+        topic.lower().strip(),
+        question_type,
+        digest.hexdigest(),
+        session.pk if session is not None else None,
+        session_cache_version(session),
+    )
+
+
+def question_cache_etag(key: QuestionCacheKey) -> str:
+    """Return a strong ETag for a key built by :func:`make_question_cache_key`."""
+
+    digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+question_cache = TTLLRUCache(maxsize=256, ttl=900.0)
+
+# Generated questions are also written to Django's cache so that, with a shared
+# backend configured, other workers reuse them instead of calling the LLM again.
+SHARED_QUESTION_CACHE_TIMEOUT = 900
+
+
+def _shared_question_cache_key(key: QuestionCacheKey) -> str:
+    return "core:qgen:" + question_cache_etag(key).strip('"')
+
+
+async def aget_cached_questions(key: QuestionCacheKey) -> Optional[List[str]]:
+    """Return cached questions for ``key`` from this process or the shared cache."""
+
+    questions = question_cache.get(key)
+    if questions is None:
+        questions = await cache.aget(_shared_question_cache_key(key))
+        if questions is not None:
+            question_cache.put(key, questions)
+    return questions
+
+
+async def astore_questions(key: QuestionCacheKey, questions: List[str]) -> None:
+    """Remember generated questions in both the process-local and shared caches."""
+
+    question_cache.put(key, questions)
+    await cache.aset(_shared_question_cache_key(key), list(questions), SHARED_QUESTION_CACHE_TIMEOUT)
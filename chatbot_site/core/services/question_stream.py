@@ -0,0 +1,56 @@
+"""Helpers for streaming generated questions to the browser as server-sent events."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+import orjson
+
+
+class QuestionStreamParser:
+    """Incrementally extract completed string items from a streamed JSON array.
+
+    The LLM answers with ``{"questions": ["...", ...]}`` in JSON mode. Feeding
+    the streamed deltas through this small bracket/string state machine yields
+    each question as soon as its closing quote arrives; strings outside an
+    array (such as the ``questions`` key) are ignored.
+    """
+
+    def __init__(self) -> None:
+        self._array_depth = 0
+        self._in_string = False
+        self._escape = False
+        self._buffer: List[str] = []
+
+    def feed(self, text: str) -> List[str]:
+        completed: List[str] = []
+        for char in text:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._array_depth > 0:
+                        try:
+                            completed.append(json.loads('"' + "".join(self._buffer) + '"'))
+                        except ValueError:
+                            pass
+                    self._buffer.clear()
+                    continue
+                self._buffer.append(char)
+            elif char == '"':
+                self._in_string = True
+            elif char == "[":
+                self._array_depth += 1
+            elif char == "]":
+                self._array_depth = max(self._array_depth - 1, 0)
+        return completed
+
+
+def sse_event(event: str, payload: Dict[str, Any]) -> bytes:
+    """Format one named server-sent event with a JSON payload."""
+
+    return b"event: " + event.encode("ascii") + b"\ndata: " + orjson.dumps(payload) + b"\n\n"
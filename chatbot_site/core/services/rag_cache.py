@@ -0,0 +1,37 @@
+"""Memoized RAG retrieval for repeated queries against an unchanged index."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List
+
+from .question_cache import TTLLRUCache, session_cache_version
+
+if TYPE_CHECKING:
+    from .rag_service import RetrievedChunk
+
+
+_retrieval_cache = TTLLRUCache(maxsize=1024, ttl=600.0)
+
+
+def get_or_retrieve(session, topic: str, top_k: int = 4) -> List[RetrievedChunk]:
+    """Return ``RagService(session).retrieve(topic, top_k)``, reusing recent results.
+
+    The key includes ``updated_at`` and ``rag_last_built_at`` so saving the
+    session or rebuilding its index invalidates earlier entries.
+    """
+
+    key = (
+        type(session).__name__,
+        session.pk,
+        *session_cache_version(session),
+        " ".join(topic.lower().split()),
+        top_k,
+    )
+    cached = _retrieval_cache.get(key)
+    if cached is not None:
+        return cached
+    from .rag_service import RagService
+
+    snippets = RagService(session).retrieve(topic, top_k=top_k)
+    _retrieval_cache.put(key, snippets)
+    return snippets
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from chromadb import Client
 from chromadb.config import Settings as ChromaSettings
@@ -23,20 +24,30 @@ class RetrievedChunk:
 
 _CHROMA_CLIENT = Client(ChromaSettings(anonymized_telemetry=False))
 
+# Approximate amount of CSV text split and indexed at a time by build_index_from_rows
+ROW_BATCH_CHARS = 64_000
+
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_embedding_function() -> OpenAIEmbeddingFunction:
+    """Return the process-wide embedding function shared by every RagService."""
+
+    return OpenAIEmbeddingFunction(
+        api_key=settings.OPENAI_API_KEY,
+        model_name=settings.OPENAI_EMBEDDING_MODEL,
+    )
+
+
 class RagService:
     """Utility for building and querying a lightweight RAG index."""
 
     def __init__(self, session: DiscussionSession) -> None:
         self.session = session
         self._client = _CHROMA_CLIENT
-        self._embedding_function = OpenAIEmbeddingFunction(
-            api_key=settings.OPENAI_API_KEY,
-            model_name=settings.OPENAI_EMBEDDING_MODEL,
-        )
+        self._embedding_function = _get_embedding_function()
         self._collection_name = f"session-{session.pk}"
         self._collection = self._get_or_create_collection()
         self._text_splitter = RecursiveCharacterTextSplitter(chunk_size=800, chunk_overlap=160)
@@ -56,64 +67,90 @@ class RagService:
         if raw_text is None:
             raw_text = getattr(self.session, "knowledge_base", None) or ""
         raw_text = str(raw_text).strip()
-        self._reset_collection()
-        if not raw_text:
-            if hasattr(self.session, "rag_chunk_count"):
-                self.session.rag_chunk_count = 0
-            if hasattr(self.session, "rag_last_built_at"):
-                self.session.rag_last_built_at = timezone.now()
-            # If the session model supports save/update fields, persist where applicable
-            try:
-                if hasattr(self.session, "save"):
-                    update_fields = []
-                    if hasattr(self.session, "rag_chunk_count"):
-                        update_fields.append("rag_chunk_count")
-                    if hasattr(self.session, "rag_last_built_at"):
-                        update_fields.append("rag_last_built_at")
-                    if update_fields:
-                        self.session.save(update_fields=update_fields)
-            except Exception:
-                # Best-effort only
-                pass
-            return 0
 
         # Split the provided text into chunks for indexing
-        chunks = self._text_splitter.split_text(raw_text)
+        chunks = self._text_splitter.split_text(raw_text) if raw_text else []
+        if chunks:
+            print(f"\n{'='*80}")
+            print(f"RAG CHUNKING: Produced {len(chunks)} chunks for session '{self.session.s_id}'")
+            print(f"{'='*80}\n")
+        return self._rebuild([chunks])
+
+    def build_index_from_rows(self, rows: Iterable[Iterable[str]]) -> int:
+        """Recreate the vector index from parsed CSV rows.
+
+        Each row is flattened to a comma-separated line. Lines are split and
+        indexed in bounded batches so the whole upload is never joined into a
+        single document.
+        """
+
+        chunk_count = self._rebuild(self._row_chunk_batches(rows))
+        print(f"\n{'='*80}")
+        print(f"RAG CHUNKING: Produced {chunk_count} chunks for session '{self.session.s_id}'")
+        print(f"{'='*80}\n")
+        return chunk_count
+
+    def _row_chunk_batches(self, rows: Iterable[Iterable[str]]) -> Iterator[List[str]]:
+        """Yield the chunks of roughly ``ROW_BATCH_CHARS`` of CSV text at a time."""
+
+        batch: List[str] = []
+        batch_chars = 0
+        for row in rows:
+            line = ", ".join(row).strip()
+            if not line:
+                continue
+            batch.append(line)
+            batch_chars += len(line) + 1
+            if batch_chars >= ROW_BATCH_CHARS:
+                yield self._text_splitter.split_text("\n".join(batch))
+                batch = []
+                batch_chars = 0
+        if batch:
+            yield self._text_splitter.split_text("\n".join(batch))
+
+    def _rebuild(self, chunk_batches: Iterable[List[str]]) -> int:
+        """Index ``chunk_batches`` into a staging collection, then swap it in.
+
+        Parsing or embedding can fail part-way through; the live index and the
+        session's build metadata are only replaced once every batch succeeded.
+        """
+
+        staging = self._create_collection(f"{self._collection_name}-staging")
+        chunk_count = 0
+        try:
+            for chunks in chunk_batches:
+                chunk_count += self._add_chunks(chunks, chunk_count, collection=staging)
+        except Exception:
+            self._delete_collection(staging.name)
+            raise
+
+        self._delete_collection(self._collection_name)
+        staging.modify(name=self._collection_name)
+        self._collection = staging
+        self._record_build(chunk_count)
+        return chunk_count
+
+    def _add_chunks(self, chunks: List[str], start_index: int, *, collection=None) -> int:
+        """Add ``chunks`` to ``collection`` (default: the live one) with ids numbered from ``start_index``."""
+
         if not chunks:
-            if hasattr(self.session, "rag_chunk_count"):
-                self.session.rag_chunk_count = 0
-            if hasattr(self.session, "rag_last_built_at"):
-                self.session.rag_last_built_at = timezone.now()
-            try:
-                if hasattr(self.session, "save"):
-                    update_fields = []
-                    if hasattr(self.session, "rag_chunk_count"):
-                        update_fields.append("rag_chunk_count")
-                    if hasattr(self.session, "rag_last_built_at"):
-                        update_fields.append("rag_last_built_at")
-                    if update_fields:
-                        self.session.save(update_fields=update_fields)
-            except Exception:
-                pass
             return 0
 
         # Prepare ids and metadata so we can print key/value pairs for each chunk
-        chunk_ids = [f"knowledge-{index}" for index in range(len(chunks))]
+        chunk_ids = [f"knowledge-{start_index + offset}" for offset in range(len(chunks))]
         chunk_metadata = [
             {
                 "session": self.session.s_id,
-                "chunk_index": index,
+                "chunk_index": start_index + offset,
             }
-            for index in range(len(chunks))
+            for offset in range(len(chunks))
         ]
 
         # Print key/value pairs for each chunk
-        print(f"\n{'='*80}")
-        print(f"RAG CHUNKING: Produced {len(chunks)} chunks for session '{self.session.s_id}'")
-        print(f"{'='*80}\n")
-        for index, chunk in enumerate(chunks):
-            cid = chunk_ids[index]
-            meta = chunk_metadata[index]
+        for offset, chunk in enumerate(chunks):
+            index = start_index + offset
+            cid = chunk_ids[offset]
+            meta = chunk_metadata[offset]
             print("-" * 80)
             print(f"Chunk: {index}")
             print(f"Key: id")
@@ -128,11 +165,17 @@ class RagService:
             print("-" * 80)
             print()
             logger.info("RAG chunk %d (id=%s session=%s)", index, cid, self.session.s_id)
-        self._collection.add(ids=chunk_ids, documents=chunks, metadatas=chunk_metadata)
+        (collection or self._collection).add(ids=chunk_ids, documents=chunks, metadatas=chunk_metadata)
+        return len(chunks)
+
+    def _record_build(self, chunk_count: int) -> None:
+        """Persist chunk count and build time on sessions that track them."""
+
         if hasattr(self.session, "rag_chunk_count"):
-            self.session.rag_chunk_count = len(chunks)
+            self.session.rag_chunk_count = chunk_count
         if hasattr(self.session, "rag_last_built_at"):
             self.session.rag_last_built_at = timezone.now()
+        # If the session model supports save/update fields, persist where applicable
         try:
             if hasattr(self.session, "save"):
                 update_fields = []
@@ -141,10 +184,12 @@ class RagService:
                 if hasattr(self.session, "rag_last_built_at"):
                     update_fields.append("rag_last_built_at")
                 if update_fields:
+                    if hasattr(self.session, "updated_at"):
+                        update_fields.append("updated_at")
                     self.session.save(update_fields=update_fields)
         except Exception:
+            # Best-effort only
             pass
-        return len(chunks)
 
     def _get_or_create_collection(self):
         return self._client.get_or_create_collection(
@@ -153,17 +198,22 @@ class RagService:
             metadata={"session": self.session.s_id},
         )
 
-    def _reset_collection(self) -> None:
-        try:
-            self._client.delete_collection(name=self._collection_name)
-        except ValueError:
-            pass
-        self._collection = self._client.create_collection(
-            name=self._collection_name,
+    def _create_collection(self, name: str):
+        """Create an empty collection called ``name``, replacing any leftover one."""
+
+        self._delete_collection(name)
+        return self._client.create_collection(
+            name=name,
             embedding_function=self._embedding_function,
             metadata={"session": self.session.s_id},
         )
 
+    def _delete_collection(self, name: str) -> None:
+        try:
+            self._client.delete_collection(name=name)
+        except ValueError:
+            pass
+
     # ------------------------------------------------------------------
     # Retrieval
     # ------------------------------------------------------------------
@@ -11,6 +11,7 @@ urlpatterns = [
     path('human/moderator/', views.moderator_dashboard, name='moderator_dashboard'),
     path('api/create-session/', views.create_new_session_api, name='create_new_session_api'),
     path('api/generate-questions/', views.generate_questions_api, name='generate_questions_api'),
+    path('healthz/cache/', views.question_cache_stats, name='question_cache_stats'),
     path('human/user/<int:user_id>/', views.user_conversation, name='user_conversation'),
     
     # AI-AI deliberation
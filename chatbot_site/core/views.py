@@ -1,99 +1,227 @@
 from __future__ import annotations
 
+import codecs
+import csv
+import hashlib
+import io
+import itertools
 import json
 from typing import Any, Dict, List, Optional
 
+import orjson
+from asgiref.sync import sync_to_async
 from django.contrib import messages
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, Case, Count, Max, Q, Value, When
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
 from django.shortcuts import redirect, render
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import condition, require_http_methods
 
 from .forms import (
+    AIDeliberationSessionForm,
+    AISessionSelectionForm,
     DiscussionSessionForm,
+    GraderSessionForm,
+    GraderSessionSelectionForm,
     ParticipantIdForm,
     SessionSelectionForm,
     UserMessageForm,
 )
-from .models import DiscussionSession, UserConversation
-from .services.conversation_service import (
-    ModeratorAnalysisService,
-    UserConversationService,
+from .models import (
+    AIDebateRun,
+    AIDebateSummary,
+    AIDeliberationSession,
+    DiscussionSession,
+    GraderResponse,
+    GraderSession,
+    UserConversation,
 )
-from .services.rag_service import RagService
-from .services.openai_client import get_openai_client
+from .services.question_cache import (
+    aget_cached_questions,
+    astore_questions,
+    make_question_cache_key,
+    question_cache,
+)
+from .services.question_stream import QuestionStreamParser, sse_event
 from django.conf import settings
-import csv
-import io
+
+# core.models puts the project root on sys.path for the centralized prompts package
+from prompts.prompts import (
+    QUESTION_GENERATOR_DISCUSSION_PROMPT,
+    QUESTION_GENERATOR_GRADER_PROMPT,
+)
+
+
+# Structured output for question generation: the model must answer with an
+# object holding a list of question strings, so no free-text fallback is needed.
+_QUESTIONS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "generated_questions",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "questions": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["questions"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# question_type aliases that switch generate_questions_api into grading mode
+_GRADER_TYPES = frozenset({"grader", "grading", "score", "scoring"})
+_GRADER_REQUEST_TAIL = (
+    "Generate 4 grading prompts. Each prompt should direct the grader to score the participant's performance on a 1-10 scale and explain their reasoning."
+)
+_DISCUSSION_REQUEST_TAIL = "Generate 4 short objective questions."
+
+# Four short questions as JSON fit well under this; the cap only stops runaways
+_QUESTIONS_MAX_TOKENS = 400
+# Seconds before a question-generation call is abandoned instead of holding the request
+_QUESTIONS_TIMEOUT = 20.0
+
+
+def _json_response(payload: Dict[str, Any], status: int = 200) -> HttpResponse:
+    """Serialize ``payload`` with orjson, bypassing Django's Python JSON encoder."""
+
+    return HttpResponse(orjson.dumps(payload), content_type="application/json", status=status)
 
 
 @require_http_methods(["POST"])
-def create_new_session_api(request: HttpRequest) -> JsonResponse:
+def create_new_session_api(request: HttpRequest) -> HttpResponse:
     """API endpoint for creating a new session via modal form."""
     
     try:
-        data = json.loads(request.body)
-    except json.JSONDecodeError:
-        return JsonResponse({"success": False, "error": "Invalid JSON"}, status=400)
+        data = orjson.loads(request.body)
+    except orjson.JSONDecodeError:
+        return _json_response({"success": False, "error": "Invalid JSON"}, status=400)
     
     s_id = data.get("s_id", "").strip()
     topic = data.get("topic", "").strip()
     
     # Validation
     if not s_id:
-        return JsonResponse({"success": False, "error": "Session ID is required"})
+        return _json_response({"success": False, "error": "Session ID is required"})
     
     if not topic:
-        return JsonResponse({"success": False, "error": "Topic is required"})
-    
-    # Check for duplicate session ID
-    if DiscussionSession.objects.filter(s_id=s_id).exists():
-        return JsonResponse({"success": False, "error": f"Session ID '{s_id}' already exists"})
+        return _json_response({"success": False, "error": "Topic is required"})
     
     try:
-        # Deactivate all existing sessions
-        DiscussionSession.objects.update(is_active=False)
-        
-        # Create new session
-        new_session = DiscussionSession.objects.create(
-            s_id=s_id,
-            topic=topic,
-            is_active=True,
-        )
-        
-        return JsonResponse({
+        # Create and activate in one transaction. The unique s_id constraint
+        # rejects duplicates, even concurrent ones, and the rollback leaves the
+        # currently active session untouched.
+        try:
+            with transaction.atomic():
+                new_session = DiscussionSession.objects.create(s_id=s_id, topic=topic, is_active=True)
+                # Deactivate all other sessions; only rows that are active need rewriting
+                DiscussionSession.objects.filter(is_active=True).exclude(pk=new_session.pk).update(is_active=False)
+        except IntegrityError:
+            return _json_response({"success": False, "error": f"Session ID '{s_id}' already exists"})
+
+        return _json_response({
             "success": True,
             "session_id": new_session.pk,
             "message": f"Session '{s_id}' created successfully",
         })
     except Exception as exc:
-        return JsonResponse({"success": False, "error": str(exc)})
+        return _json_response({"success": False, "error": str(exc)})
+
+
+def _parse_generated_questions(content: str) -> List[str]:
+    """Extract up to 4 questions from the LLM's schema-constrained JSON answer.
+
+    Returns an empty list when the answer is not valid JSON, which only happens
+    if the completion was cut off or refused.
+    """
+
+    try:
+        questions = orjson.loads(content).get("questions", [])
+    except (orjson.JSONDecodeError, AttributeError):
+        return []
+    if not isinstance(questions, list):
+        return []
+    # Ensure we have at most 4 questions and clean them
+    return [text for q in questions[:4] if q and (text := str(q).strip())]
+
+
+async def _stream_generated_questions(client, messages_payload: List[Dict[str, str]], cache_key):
+    """Yield a ``question`` event as each suggestion closes, then a final ``done`` event."""
+
+    parser = QuestionStreamParser()
+    content_parts: List[str] = []
+    questions: List[str] = []
+    try:
+        stream = await client.chat.completions.create(
+            model=settings.OPENAI_MODEL_NAME,
+            messages=messages_payload,
+            response_format=_QUESTIONS_RESPONSE_FORMAT,
+            max_tokens=_QUESTIONS_MAX_TOKENS,
+            timeout=_QUESTIONS_TIMEOUT,
+            stream=True,
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            if not delta:
+                continue
+            content_parts.append(delta)
+            for question in parser.feed(delta):
+                question = str(question).strip()
+                if question and len(questions) < 4:
+                    questions.append(question)
+                    yield sse_event("question", {"question": question})
+    except Exception as exc:
+        yield sse_event("error", {"success": False, "error": str(exc)})
+        return
+
+    if not questions:
+        questions = _parse_generated_questions("".join(content_parts))
+        for question in questions:
+            yield sse_event("question", {"question": question})
+    if questions:
+        await astore_questions(cache_key, questions)
+    yield sse_event("done", {"success": True, "questions": questions})
 
 
 @require_http_methods(["POST"])
-def generate_questions_api(request: HttpRequest) -> JsonResponse:
+async def generate_questions_api(request: HttpRequest) -> HttpResponse:
     """Generate 4 candidate objective questions for a given topic using the LLM.
 
     Expects JSON body {"topic": "..."} and returns {"success": True, "questions": [...]}.
+    The view is async so the worker is released while waiting on the LLM. Clients
+    that send ``Accept: text/event-stream`` receive a ``question`` event per
+    suggestion as it is generated, followed by a ``done`` event with the full list.
     """
     try:
-        data = json.loads(request.body)
-    except json.JSONDecodeError:
-        return JsonResponse({"success": False, "error": "Invalid JSON"}, status=400)
+        data = orjson.loads(request.body)
+    except orjson.JSONDecodeError:
+        return _json_response({"success": False, "error": "Invalid JSON"}, status=400)
 
     topic = (data.get("topic") or "").strip()
     if not topic:
-        return JsonResponse({"success": False, "error": "Topic is required"}, status=400)
+        return _json_response({"success": False, "error": "Topic is required"}, status=400)
+
+    # The OpenAI SDK and chromadb are heavy; load them on first use rather than at worker boot.
+    from .services.openai_client import get_async_openai_client
 
-    question_type_raw = (data.get("question_type") or "discussion").lower()
-    question_type = question_type_raw.strip()
-    is_grader_mode = question_type in {"grader", "grading", "score", "scoring"}
+    question_type = (data.get("question_type") or "discussion").strip().casefold()
+    is_grader_mode = question_type in _GRADER_TYPES
 
     try:
         session_obj: Optional[DiscussionSession] = None
         session_id_value = data.get("session_id")
         if session_id_value:
             try:
-                session_obj = DiscussionSession.objects.get(pk=int(session_id_value))
+                session_obj = await DiscussionSession.objects.aget(pk=int(session_id_value))
             except (ValueError, TypeError, DiscussionSession.DoesNotExist):
                 session_obj = None
 
@@ -101,90 +229,102 @@ def generate_questions_api(request: HttpRequest) -> JsonResponse:
         existing_questions_raw = data.get("current_questions") or []
         if not isinstance(existing_questions_raw, list):
             existing_questions_raw = []
-        existing_questions = [str(item).strip() for item in existing_questions_raw if str(item).strip()]
+        existing_questions = [text for item in existing_questions_raw if (text := str(item).strip())]
+
+        cache_key = make_question_cache_key(
+            topic,
+            question_type,
+            existing_questions,
+            session_obj,
+            knowledge_base,
+        )
+        cached_questions = await aget_cached_questions(cache_key)
+        if cached_questions is not None:
+            return _json_response({"success": True, "questions": cached_questions})
 
-        rag_context_chunks: list[str] = []
+        # Without a session there is no index to query; only the inline knowledge base applies.
+        rag_context = ""
         if session_obj is not None:
+            from .services.rag_cache import get_or_retrieve
+
             try:
-                rag_snippets = RagService(session_obj).retrieve(topic, top_k=4)
+                rag_snippets = await sync_to_async(get_or_retrieve)(session_obj, topic, 4)
             except Exception:
                 rag_snippets = []
+            # Overlapping index chunks often open with the same passage; send each once
+            seen_openings = set()
+            rag_lines = []
             for chunk in rag_snippets:
                 text = (chunk.text or "").strip()
-                if not text:
+                opening = " ".join(text[:120].split()).casefold()
+                if not text or opening in seen_openings:
                     continue
-                if len(text) > 400:
-                    text = text[:400].rstrip() + "..."
-                rag_context_chunks.append(f"- {text}")
-
-        if not rag_context_chunks and knowledge_base:
-            snippet = knowledge_base.strip()
-            if len(snippet) > 1500:
-                snippet = snippet[:1500].rstrip() + "\n... (truncated)"
-            rag_context_chunks.append(snippet)
-
-        client = get_openai_client()
-        if is_grader_mode:
-            system = (
-                "You are a helpful assistant that drafts objective grading prompts. "
-                "Given a topic and optional background excerpts, produce exactly four concise prompts that ask participants to assign a score from 1 (poor) to 10 (excellent) and provide a short explanation. "
-                "Avoid reusing any prompts that the moderator already selected. "
-                "Each prompt must clearly describe what the grader is evaluating while remaining neutral and factual. "
-                "Return ONLY a JSON object with a 'questions' key containing an array of 4 prompt strings. "
-                "Example format: {\"questions\": [\"Rate how clearly the participant explained...\", ...]}"
-            )
-        else:
-            system = (
-                "You are a helpful assistant that creates short, objective, neutral discussion questions. "
-                "Given a topic and optional background excerpts, produce exactly four concise objective questions suitable for asking participants. "
-                "Avoid reusing any questions that the moderator already selected. "
-                "Return ONLY a JSON object with a 'questions' key containing an array of 4 question strings. "
-                "Example format: {\"questions\": [\"question 1\", \"question 2\", \"question 3\", \"question 4\"]}"
+                seen_openings.add(opening)
+                rag_lines.append(f"- {text[:397]}..." if len(text) > 400 else f"- {text}")
+            rag_context = "\n".join(rag_lines)
+
+        if not rag_context and knowledge_base:
+            rag_context = (
+                knowledge_base if len(knowledge_base) <= 1500 else knowledge_base[:1500] + "\n... (truncated)"
             )
+
+        client = get_async_openai_client()
+        system = QUESTION_GENERATOR_GRADER_PROMPT if is_grader_mode else QUESTION_GENERATOR_DISCUSSION_PROMPT
         user_sections = [f"Topic: {topic}"]
         if existing_questions:
             existing_block = "\n".join(f"- {question}" for question in existing_questions)
             user_sections.append("Existing questions to avoid repeating:\n" + existing_block)
-        if rag_context_chunks:
-            user_sections.append("Relevant background excerpts:\n" + "\n".join(rag_context_chunks))
-        if is_grader_mode:
-            user_sections.append(
-                "Generate 4 grading prompts. Each prompt should direct the grader to score the participant's performance on a 1-10 scale and explain their reasoning."
-            )
-        else:
-            user_sections.append("Generate 4 short objective questions.")
+        if rag_context:
+            user_sections.append("Relevant background excerpts:\n" + rag_context)
+        user_sections.append(_GRADER_REQUEST_TAIL if is_grader_mode else _DISCUSSION_REQUEST_TAIL)
         user = "\n\n".join(user_sections)
-        completion = client.chat.completions.create(
+        messages_payload = [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ]
+        if "text/event-stream" in request.headers.get("Accept", ""):
+            response = StreamingHttpResponse(
+                _stream_generated_questions(client, messages_payload, cache_key),
+                content_type="text/event-stream",
+            )
+            response["Cache-Control"] = "no-cache"
+            response["X-Accel-Buffering"] = "no"
+            return response
+
+        completion = await client.chat.completions.create(
             model=settings.OPENAI_MODEL_NAME,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-            response_format={"type": "json_object"},
+            messages=messages_payload,
+            response_format=_QUESTIONS_RESPONSE_FORMAT,
+            max_tokens=_QUESTIONS_MAX_TOKENS,
+            timeout=_QUESTIONS_TIMEOUT,
         )
-        content = completion.choices[0].message.content or ""
-        try:
-            response_data = json.loads(content)
-            questions = response_data.get("questions", [])
-            if not isinstance(questions, list):
-                questions = []
-            # Ensure we have exactly 4 questions and clean them
-            questions = [str(q).strip() for q in questions[:4] if q]
-        except Exception as e:
-            # Fallback: try to extract lines and return up to 4 short lines
-            # Remove common JSON artifacts and clean up
-            cleaned = content.replace('[', '').replace(']', '').replace('{', '').replace('}', '')
-            cleaned = cleaned.replace('"questions":', '').replace('"', '')
-            lines = [l.strip('-, ').strip() for l in cleaned.splitlines() if l.strip() and len(l.strip()) > 10]
-            questions = [q for q in lines[:4] if q]
-
-        return JsonResponse({"success": True, "questions": questions})
+        questions = _parse_generated_questions(completion.choices[0].message.content or "")
+        if questions:
+            await astore_questions(cache_key, questions)
+        return _json_response({"success": True, "questions": questions})
     except Exception as exc:
-        return JsonResponse({"success": False, "error": str(exc)}, status=500)
+        return _json_response({"success": False, "error": str(exc)}, status=500)
+
+
+@require_http_methods(["GET"])
+def question_cache_stats(request: HttpRequest) -> HttpResponse:
+    """Report hit/miss counters for the question-generation cache."""
+
+    return _json_response(question_cache.stats())
+
+
+def _active_session(request: HttpRequest) -> DiscussionSession:
+    """Return the active discussion session, memoized on the request."""
+
+    session = getattr(request, "_active_session", None)
+    if session is None:
+        session = DiscussionSession.get_active()
+        request._active_session = session
+    return session
 
 
 def entry_point(request: HttpRequest) -> HttpResponse:
-    session = DiscussionSession.get_active()
+    session = _active_session(request)
     if request.method == "POST":
         form = ParticipantIdForm(request.POST)
         if form.is_valid():
@@ -206,47 +346,194 @@ def entry_point(request: HttpRequest) -> HttpResponse:
     )
 
 
-def moderator_dashboard(request: HttpRequest) -> HttpResponse:
-    sessions = DiscussionSession.objects.all().order_by("-updated_at")
-    selected_session: Optional[DiscussionSession] = None
+def _read_knowledge_upload(uploaded) -> str:
+    """Decode an uploaded .txt knowledge file without buffering it twice.
 
-    # Check for session_id in query parameters (from API redirect)
-    query_session_id = request.GET.get("session_id")
-    if query_session_id:
-        try:
-            selected_session = sessions.filter(pk=int(query_session_id)).first()
-            if selected_session:
-                request.session["moderator_selected_session_id"] = int(query_session_id)
-        except (TypeError, ValueError):
-            pass
+    Bytes are decoded incrementally as UTF-8 (undecodable bytes are replaced).
+    CSV uploads go through :func:`_iter_csv_upload` instead.
+    """
 
-    # Fall back to session-stored selection or active session
-    if selected_session is None:
-        selected_session_id = request.session.get("moderator_selected_session_id")
-        if selected_session_id:
-            selected_session = sessions.filter(pk=selected_session_id).first()
-    
+    return ''.join(codecs.iterdecode(uploaded.chunks(), 'utf-8', errors='replace'))
+
+
+def _is_csv_upload(uploaded) -> bool:
+    return (uploaded.name or '').lower().endswith('.csv')
+
+
+def _iter_csv_upload(uploaded):
+    """Return a csv.reader over an upload, decoding it line by line."""
+
+    # Iterating an UploadedFile yields byte lines assembled from its chunks
+    return csv.reader(codecs.iterdecode(uploaded, 'utf-8', errors='replace'))
+
+
+def _as_int_or_none(value: Optional[str]) -> Optional[int]:
+    """Parse a non-negative integer id from request data, or return None."""
+
+    # isascii() keeps non-ASCII digits such as "²", which int() rejects, out
+    return int(value) if value and value.isascii() and value.isdigit() else None
+
+
+def _query_session_pk(request: HttpRequest) -> Optional[int]:
+    """Return the ``?session_id=`` value as an int, or None when absent or malformed."""
+
+    return _as_int_or_none(request.GET.get("session_id"))
+
+
+def _resolve_selected_session(
+    sessions: List[Any],
+    query_pk: Optional[int],
+    stored_pk: Optional[int],
+) -> Optional[Any]:
+    """Pick the dashboard's session from ``?session_id=``, the stored selection, or the active one.
+
+    ``sessions`` is the already-materialized list the dashboard renders, so the
+    lookups are done in memory instead of issuing one query per fallback.
+    """
+
+    sessions_by_id = {session.pk: session for session in sessions}
+    selected_session = None
+    if query_pk is not None:
+        selected_session = sessions_by_id.get(query_pk)
+    if selected_session is None and stored_pk:
+        selected_session = sessions_by_id.get(stored_pk)
     if selected_session is None:
-        selected_session = sessions.filter(is_active=True).order_by("-updated_at").first()
+        # sessions are ordered by -updated_at, so the first active one is the most recent
+        selected_session = next((session for session in sessions if session.is_active), None)
+    return selected_session
+
+
+# Signed cookies holding the AI and grader dashboards' selected session. This is
+# UI-only state, so keeping it out of request.session avoids a session-store
+# read and write on every dashboard request.
+_AI_SELECTION_COOKIE = "ai_mod_sid"
+_GRADER_SELECTION_COOKIE = "grader_mod_sid"
+
+
+def _get_selection_cookie(request: HttpRequest, name: str) -> Optional[int]:
+    return _as_int_or_none(request.get_signed_cookie(name, default=None, salt=name, max_age=settings.SESSION_COOKIE_AGE))
+
+
+def _set_selection_cookie(response: HttpResponse, name: str, pk: int) -> HttpResponse:
+    response.set_signed_cookie(
+        name,
+        str(pk),
+        salt=name,
+        max_age=settings.SESSION_COOKIE_AGE,
+        httponly=True,
+        samesite="Lax",
+    )
+    return response
+
+
+def _load_session_from_post(request: HttpRequest, url_name: str, cookie_name: str) -> Optional[HttpResponse]:
+    """Handle a dashboard ``load_session`` POST before any dashboard data is queried.
+
+    Returns the redirect that stores or clears the selection cookie, or None
+    (with an error message queued) when the posted id is malformed and the
+    dashboard should re-render.
+    """
+
+    target_id = request.POST.get("session_id")
+    if not target_id:
+        response = redirect(url_name)
+        response.delete_cookie(cookie_name)
+        return response
+    target_pk = _as_int_or_none(target_id)
+    if target_pk is None:
+        messages.error(request, "Unable to load the requested session.")
+        return None
+    return _set_selection_cookie(redirect(url_name), cookie_name, target_pk)
+
+
+# The dashboard HTML may be stored by the browser but must be revalidated on every load
+_DASHBOARD_CACHE_CONTROL = "private, no-cache"
+
+
+def _moderator_dashboard_etag(
+    sessions: List[DiscussionSession],
+    selected_session: Optional[DiscussionSession],
+    csrf_cookie: str,
+) -> str:
+    """Return an ETag covering the rows the moderator dashboard renders.
+
+    The picker is covered by each session's pk, ``updated_at`` and active flag
+    (activation flips the flag with a queryset update), and the conversation
+    list by the newest conversation ``updated_at`` and the conversation count.
+    A summary that goes stale changes no row, so its running state is hashed too.
+    The page embeds CSRF tokens for its forms, so the CSRF cookie is part of the
+    tag and a reused copy never carries tokens for an older secret.
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{csrf_cookie}|".encode("utf-8"))
+    for session in sessions:
+        digest.update(f"{session.pk}:{session.updated_at.isoformat()}:{session.is_active};".encode("utf-8"))
+    if selected_session is not None:
+        conversation_state = selected_session.conversations.aggregate(
+            latest=Max("updated_at"),
+            count=Count("pk"),
+        )
+        latest = conversation_state["latest"]
+        digest.update(
+            f"|{selected_session.pk}:{latest.isoformat() if latest else ''}:{conversation_state['count']}"
+            f":{selected_session.summary_running}".encode("utf-8")
+        )
+    return f'"{digest.hexdigest()}"'
+
+
+def moderator_dashboard(request: HttpRequest) -> HttpResponse:
+    # Switching sessions only stores the choice and redirects, so it is handled
+    # before the dashboard's own queries run.
+    if request.method == "POST" and request.POST.get("action") == "load_session":
+        target_id = request.POST.get("session_id")
+        if not target_id:
+            request.session.pop("moderator_selected_session_id", None)
+            return redirect("moderator_dashboard")
+        target_pk = _as_int_or_none(target_id)
+        if target_pk is not None:
+            request.session["moderator_selected_session_id"] = target_pk
+            return redirect("moderator_dashboard")
+        messages.error(request, "Unable to load the requested session.")
+
+    # The picker only shows id and topic, so the large text columns (knowledge
+    # base, prompts, summaries) are loaded for the selected session alone.
+    sessions = list(
+        DiscussionSession.objects.only(
+            "s_id", "topic", "is_active", "updated_at", "summary_in_progress", "summary_started_at"
+        ).order_by("-updated_at")
+    )
+    query_pk = _query_session_pk(request)
+    selected_session: Optional[DiscussionSession] = _resolve_selected_session(
+        sessions, query_pk, request.session.get("moderator_selected_session_id")
+    )
+    if selected_session is not None and selected_session.pk == query_pk:
+        request.session["moderator_selected_session_id"] = query_pk
+
+    etag: Optional[str] = None
+    if request.method == "GET":
+        csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+        etag = _moderator_dashboard_etag(sessions, selected_session, csrf_cookie)
+        # Pending flash messages still have to be rendered, and without a CSRF cookie
+        # only a full render sets one, so a 304 is safe only when neither applies
+        if (
+            csrf_cookie
+            and request.headers.get("If-None-Match") == etag
+            and not len(messages.get_messages(request))
+        ):
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            response["Cache-Control"] = _DASHBOARD_CACHE_CONTROL
+            return response
+
+    if selected_session is not None:
+        selected_session = DiscussionSession.objects.get(pk=selected_session.pk)
 
-    session_form: DiscussionSessionForm
+    session_form: Optional[DiscussionSessionForm] = None
 
     if request.method == "POST":
         action = request.POST.get("action")
 
-        if action == "load_session":
-            target_id = request.POST.get("session_id")
-            if target_id:
-                try:
-                    request.session["moderator_selected_session_id"] = int(target_id)
-                except (TypeError, ValueError):
-                    messages.error(request, "Unable to load the requested session.")
-                else:
-                    return redirect("moderator_dashboard")
-            else:
-                request.session.pop("moderator_selected_session_id", None)
-                return redirect("moderator_dashboard")
-
         if action in {"save_session", "create_session"}:
             instance = selected_session if (action == "save_session" and selected_session) else None
             session_form = DiscussionSessionForm(request.POST, instance=instance)
@@ -272,22 +559,14 @@ def moderator_dashboard(request: HttpRequest) -> HttpResponse:
             else:
                 # Support optional file upload (.txt or .csv) or inline knowledge_base text
                 raw_text = None
+                csv_rows = None
                 uploaded = request.FILES.get('knowledge_file')
-                if uploaded is not None:
+                if uploaded is not None and _is_csv_upload(uploaded):
+                    # CSV rows are fed straight to the indexer without joining them first
+                    csv_rows = _iter_csv_upload(uploaded)
+                elif uploaded is not None:
                     try:
-                        content = uploaded.read()
-                        try:
-                            text = content.decode('utf-8')
-                        except Exception:
-                            text = content.decode('latin-1')
-                        name = (uploaded.name or '').lower()
-                        if name.endswith('.csv'):
-                            # Parse CSV into human-readable lines
-                            reader = csv.reader(io.StringIO(text))
-                            rows = [', '.join([cell for cell in row]) for row in reader]
-                            raw_text = '\n'.join(rows)
-                        else:
-                            raw_text = text
+                        raw_text = _read_knowledge_upload(uploaded)
                     except Exception as exc:  # pragma: no cover - defensive
                         messages.error(request, f"Failed to read uploaded file: {exc}")
                         return redirect("moderator_dashboard")
@@ -295,8 +574,14 @@ def moderator_dashboard(request: HttpRequest) -> HttpResponse:
                     # Use posted knowledge_base if provided, otherwise fall back to session field
                     raw_text = request.POST.get('knowledge_base') or None
 
+                from .services.rag_service import RagService
+
                 try:
-                    chunk_count = RagService(selected_session).build_index(raw_text=raw_text)
+                    rag_service = RagService(selected_session)
+                    if csv_rows is not None:
+                        chunk_count = rag_service.build_index_from_rows(csv_rows)
+                    else:
+                        chunk_count = rag_service.build_index(raw_text=raw_text)
                 except Exception as exc:  # pragma: no cover - defensive
                     messages.error(request, f"Failed to rebuild the RAG index: {exc}")
                 else:
@@ -315,17 +600,22 @@ def moderator_dashboard(request: HttpRequest) -> HttpResponse:
             if selected_session is None:
                 messages.error(request, "Select a session before running the analysis.")
             else:
-                analyzer = ModeratorAnalysisService(selected_session)
-                summary = analyzer.generate_summary()
-                if summary is None:
+                from .services.conversation_service import ModeratorAnalysisService
+
+                analysis_service = ModeratorAnalysisService(selected_session)
+                if selected_session.summary_running and not request.POST.get("force_restart"):
+                    messages.info(request, "A moderator summary is already being generated.")
+                elif not analysis_service.has_user_views():
+                    # Opening the chat page creates an empty conversation, so existence alone is not enough
                     messages.info(request, "No user view documents found yet.")
                 else:
-                    messages.success(request, "Generated moderator summary.")
+                    # The LLM call and clustering run in the background; the
+                    # dashboard polls until summary_in_progress clears.
+                    analysis_service.start_summary(blocking=False)
+                    messages.success(request, "Generating moderator summary. It will appear here when ready.")
                 return redirect("moderator_dashboard")
-    else:
-        session_form = DiscussionSessionForm(instance=selected_session)
 
-    if request.method == "POST" and "session_form" not in locals():
+    if session_form is None:
         session_form = DiscussionSessionForm(instance=selected_session)
 
     selection_initial = {
@@ -339,15 +629,19 @@ def moderator_dashboard(request: HttpRequest) -> HttpResponse:
 
     available_views = []
     if selected_session is not None:
-        for conversation in selected_session.conversations.order_by("user_id"):
-            available_views.append(
-                {
-                    "user_id": conversation.user_id,
-                    "message_count": conversation.message_count,
-                    "active": conversation.active,
-                    "has_views": bool(conversation.views_markdown),
-                }
+        # Only the presence of a views document matters here, so test it in SQL
+        # instead of pulling every markdown blob into Python.
+        available_views = list(
+            selected_session.conversations.order_by("user_id")
+            .annotate(
+                has_views=Case(
+                    When(views_markdown="", then=Value(False)),
+                    default=Value(True),
+                    output_field=BooleanField(),
+                )
             )
+            .values("user_id", "message_count", "active", "has_views")
+        )
 
     context: Dict[str, Any] = {
         "selection_form": selection_form,
@@ -356,12 +650,18 @@ def moderator_dashboard(request: HttpRequest) -> HttpResponse:
         "sessions": sessions,
         "available_views": available_views,
     }
-    return render(request, "core/moderator_dashboard.html", context)
+    response = render(request, "core/moderator_dashboard.html", context)
+    if etag is not None:
+        response["ETag"] = etag
+        response["Cache-Control"] = _DASHBOARD_CACHE_CONTROL
+    return response
 
 
 def user_conversation(request: HttpRequest, user_id: int) -> HttpResponse:
     """Unified participant view handling both grading and discussion questions inline."""
-    session = DiscussionSession.get_active()
+    from .services.conversation_service import UserConversationService
+
+    session = _active_session(request)
     conversation, _ = UserConversation.objects.get_or_create(session=session, user_id=user_id)
 
     all_questions = session.get_all_questions() if session else []
@@ -371,9 +671,9 @@ def user_conversation(request: HttpRequest, user_id: int) -> HttpResponse:
     # Check if we've completed all questions
     if current_index >= total_questions:
         conversation.active = False
-        conversation.save(update_fields=["active"])
+        conversation.save(update_fields=["active", "updated_at"])
 
-    current_question = session.get_question_at(current_index) if session and current_index < total_questions else None
+    current_question = all_questions[current_index] if current_index < total_questions else None
     current_question_text = current_question["text"] if current_question else ""
     current_question_type = current_question["type"] if current_question else "discussion"
 
@@ -394,7 +694,7 @@ def user_conversation(request: HttpRequest, user_id: int) -> HttpResponse:
             else:
                 messages.info(request, "Conversation stopped. Final views document generated.")
                 views_snapshot = final_views
-                conversation.refresh_from_db()
+            # The service saved this same instance, so it is already current
             temp_snapshot = conversation.scratchpad
 
         elif action == "submit_grading" and current_question_type == "grading":
@@ -428,6 +728,15 @@ def user_conversation(request: HttpRequest, user_id: int) -> HttpResponse:
                     conversation.consecutive_no_new = 0
                     # Clear the conversation history for the new question
                     conversation.history = []
+                    update_fields = [
+                        "responses",
+                        "current_question_index",
+                        "question_followups",
+                        "consecutive_no_new",
+                        "history",
+                        "active",
+                        "updated_at",
+                    ]
 
                     # Check if that was the last question
                     if conversation.current_question_index >= total_questions:
@@ -436,11 +745,12 @@ def user_conversation(request: HttpRequest, user_id: int) -> HttpResponse:
                         service = UserConversationService(session, conversation)
                         final_views = service._finalize_from_temp()
                         views_snapshot = final_views
+                        update_fields += ["views_markdown", "unique_concepts", "content_length"]
                         messages.info(request, "All questions completed. Thank you for your participation.")
                     else:
                         messages.success(request, "Response recorded. Moving to next question.")
 
-                    conversation.save()
+                    conversation.save(update_fields=update_fields)
                     return redirect("user_conversation", user_id=user_id)
 
         elif action == "send" and current_question_type == "discussion":
@@ -491,17 +801,19 @@ def user_conversation(request: HttpRequest, user_id: int) -> HttpResponse:
             else:
                 messages.error(request, "Please enter a response before submitting.")
 
-    # Refresh state after potential changes
-    conversation.refresh_from_db()
+    # Services mutate and save this same instance; reload after a POST only so an
+    # error part-way through cannot leave unsaved in-memory changes on the page.
+    if request.method == "POST":
+        conversation.refresh_from_db()
     current_index = conversation.current_question_index
-    current_question = session.get_question_at(current_index) if session and current_index < total_questions else None
+    current_question = all_questions[current_index] if current_index < total_questions else None
     current_question_text = current_question["text"] if current_question else ""
     current_question_type = current_question["type"] if current_question else "discussion"
 
     # For discussion questions, get the next question preview
     next_question = None
     if conversation.active and current_index + 1 < total_questions:
-        next_question = session.get_question_at(current_index + 1)
+        next_question = all_questions[current_index + 1]
 
     # Get follow-up info (only relevant for discussion questions)
     followup_limit = session.question_followup_limit if session else 3
@@ -571,8 +883,6 @@ def ai_entry_point(request: HttpRequest) -> HttpResponse:
 
 def grader_entry_point(request: HttpRequest) -> HttpResponse:
     """Entry point for Grader sessions (participant access)."""
-    from .models import GraderSession
-    from .forms import ParticipantIdForm
 
     session = GraderSession.get_active()
     if request.method == "POST":
@@ -598,49 +908,24 @@ def grader_entry_point(request: HttpRequest) -> HttpResponse:
 
 def ai_moderator_dashboard(request: HttpRequest) -> HttpResponse:
     """Moderator dashboard for AI-AI deliberation."""
-    from .forms import AIDeliberationSessionForm, AISessionSelectionForm
-    from .models import AIDeliberationSession
-
-    sessions = AIDeliberationSession.objects.all().order_by("-updated_at")
-    selected_session: Optional[AIDeliberationSession] = None
-
-    # Check for session_id in query parameters
-    query_session_id = request.GET.get("session_id")
-    if query_session_id:
-        try:
-            selected_session = sessions.filter(pk=int(query_session_id)).first()
-            if selected_session:
-                request.session["ai_moderator_selected_session_id"] = int(query_session_id)
-        except (TypeError, ValueError):
-            pass
+    from .services.rag_service import RagService
 
-    # Fall back to session-stored selection or active session
-    if selected_session is None:
-        selected_session_id = request.session.get("ai_moderator_selected_session_id")
-        if selected_session_id:
-            selected_session = sessions.filter(pk=selected_session_id).first()
+    if request.method == "POST" and request.POST.get("action") == "load_session":
+        response = _load_session_from_post(request, "ai_moderator_dashboard", _AI_SELECTION_COOKIE)
+        if response is not None:
+            return response
 
-    if selected_session is None:
-        selected_session = sessions.filter(is_active=True).order_by("-updated_at").first()
+    sessions = list(AIDeliberationSession.objects.order_by("-updated_at"))
+    query_pk = _query_session_pk(request)
+    selected_session: Optional[AIDeliberationSession] = _resolve_selected_session(
+        sessions, query_pk, _get_selection_cookie(request, _AI_SELECTION_COOKIE)
+    )
 
-    session_form: AIDeliberationSessionForm
+    session_form: Optional[AIDeliberationSessionForm] = None
 
     if request.method == "POST":
         action = request.POST.get("action")
 
-        if action == "load_session":
-            target_id = request.POST.get("session_id")
-            if target_id:
-                try:
-                    request.session["ai_moderator_selected_session_id"] = int(target_id)
-                except (TypeError, ValueError):
-                    messages.error(request, "Unable to load the requested session.")
-                else:
-                    return redirect("ai_moderator_dashboard")
-            else:
-                request.session.pop("ai_moderator_selected_session_id", None)
-                return redirect("ai_moderator_dashboard")
-
         if action in {"save_session", "create_session"}:
             instance = selected_session if (action == "save_session" and selected_session) else None
             session_form = AIDeliberationSessionForm(request.POST, instance=instance)
@@ -649,9 +934,8 @@ def ai_moderator_dashboard(request: HttpRequest) -> HttpResponse:
                 if not new_session.pk:
                     new_session.is_active = False
                 new_session.save()
-                request.session["ai_moderator_selected_session_id"] = new_session.pk
                 messages.success(request, "AI session saved.")
-                return redirect("ai_moderator_dashboard")
+                return _set_selection_cookie(redirect("ai_moderator_dashboard"), _AI_SELECTION_COOKIE, new_session.pk)
             else:
                 # Form is invalid; show errors and re-render
                 messages.error(request, "Please fix the errors below.")
@@ -660,9 +944,8 @@ def ai_moderator_dashboard(request: HttpRequest) -> HttpResponse:
                 messages.error(request, "Select a session before activating it.")
             else:
                 selected_session.activate()
-                request.session["ai_moderator_selected_session_id"] = selected_session.pk
                 messages.success(request, f"AI session {selected_session.s_id} is now active.")
-                return redirect("ai_moderator_dashboard")
+                return _set_selection_cookie(redirect("ai_moderator_dashboard"), _AI_SELECTION_COOKIE, selected_session.pk)
         elif action == "run_deliberation":
             if selected_session is None:
                 messages.error(request, "Select a session before running deliberation.")
@@ -684,21 +967,14 @@ def ai_moderator_dashboard(request: HttpRequest) -> HttpResponse:
             else:
                 # Support optional file upload (.txt or .csv) or inline knowledge_base text
                 raw_text = None
+                csv_rows = None
                 uploaded = request.FILES.get('knowledge_file')
-                if uploaded is not None:
+                if uploaded is not None and _is_csv_upload(uploaded):
+                    # CSV rows are fed straight to the indexer without joining them first
+                    csv_rows = _iter_csv_upload(uploaded)
+                elif uploaded is not None:
                     try:
-                        content = uploaded.read()
-                        try:
-                            text = content.decode('utf-8')
-                        except Exception:
-                            text = content.decode('latin-1')
-                        name = (uploaded.name or '').lower()
-                        if name.endswith('.csv'):
-                            reader = csv.reader(io.StringIO(text))
-                            rows = [', '.join([cell for cell in row]) for row in reader]
-                            raw_text = '\n'.join(rows)
-                        else:
-                            raw_text = text
+                        raw_text = _read_knowledge_upload(uploaded)
                     except Exception as exc:
                         messages.error(request, f"Failed to read uploaded file: {exc}")
                         return redirect("ai_moderator_dashboard")
@@ -706,7 +982,11 @@ def ai_moderator_dashboard(request: HttpRequest) -> HttpResponse:
                     raw_text = request.POST.get('knowledge_base') or None
 
                 try:
-                    chunk_count = RagService(selected_session).build_index(raw_text=raw_text)
+                    rag_service = RagService(selected_session)
+                    if csv_rows is not None:
+                        chunk_count = rag_service.build_index_from_rows(csv_rows)
+                    else:
+                        chunk_count = rag_service.build_index(raw_text=raw_text)
                 except Exception as exc:
                     messages.error(request, f"Failed to rebuild the RAG index: {exc}")
                 else:
@@ -716,8 +996,7 @@ def ai_moderator_dashboard(request: HttpRequest) -> HttpResponse:
                         messages.success(request, f"RAG index rebuilt with {chunk_count} knowledge snippets.")
                 return redirect("ai_moderator_dashboard")
     
-    # Initialize session_form if not already set
-    if "session_form" not in locals():
+    if session_form is None:
         session_form = AIDeliberationSessionForm(instance=selected_session)
 
     selection_initial = {
@@ -735,53 +1014,32 @@ def ai_moderator_dashboard(request: HttpRequest) -> HttpResponse:
         "selected_session": selected_session,
         "sessions": sessions,
     }
-    return render(request, "core/ai_moderator_dashboard.html", context)
+    response = render(request, "core/ai_moderator_dashboard.html", context)
+    if selected_session is not None and selected_session.pk == query_pk:
+        _set_selection_cookie(response, _AI_SELECTION_COOKIE, query_pk)
+    return response
 
 
 def grader_moderator_dashboard(request: HttpRequest) -> HttpResponse:
     """Moderator dashboard for Grader sessions."""
-    from .forms import GraderSessionForm, GraderSessionSelectionForm
-    from .models import GraderSession, GraderResponse
     from .services.rag_service import RagService
 
-    sessions = GraderSession.objects.all().order_by("-updated_at")
-    selected_session = None
-
-    query_session_id = request.GET.get("session_id")
-    if query_session_id:
-        try:
-            selected_session = sessions.filter(pk=int(query_session_id)).first()
-            if selected_session:
-                request.session["grader_moderator_selected_session_id"] = int(query_session_id)
-        except (TypeError, ValueError):
-            pass
-
-    if selected_session is None:
-        selected_session_id = request.session.get("grader_moderator_selected_session_id")
-        if selected_session_id:
-            selected_session = sessions.filter(pk=selected_session_id).first()
+    if request.method == "POST" and request.POST.get("action") == "load_session":
+        response = _load_session_from_post(request, "grader_moderator_dashboard", _GRADER_SELECTION_COOKIE)
+        if response is not None:
+            return response
 
-    if selected_session is None:
-        selected_session = sessions.filter(is_active=True).order_by("-updated_at").first()
+    sessions = list(GraderSession.objects.order_by("-updated_at"))
+    query_pk = _query_session_pk(request)
+    selected_session = _resolve_selected_session(
+        sessions, query_pk, _get_selection_cookie(request, _GRADER_SELECTION_COOKIE)
+    )
 
-    session_form: GraderSessionForm
+    session_form: Optional[GraderSessionForm] = None
 
     if request.method == "POST":
         action = request.POST.get("action")
 
-        if action == "load_session":
-            target_id = request.POST.get("session_id")
-            if target_id:
-                try:
-                    request.session["grader_moderator_selected_session_id"] = int(target_id)
-                except (TypeError, ValueError):
-                    messages.error(request, "Unable to load the requested session.")
-                else:
-                    return redirect("grader_moderator_dashboard")
-            else:
-                request.session.pop("grader_moderator_selected_session_id", None)
-                return redirect("grader_moderator_dashboard")
-
         if action in {"save_session", "create_session"}:
             instance = selected_session if (action == "save_session" and selected_session) else None
             session_form = GraderSessionForm(request.POST, instance=instance)
@@ -790,9 +1048,8 @@ def grader_moderator_dashboard(request: HttpRequest) -> HttpResponse:
                 if not new_session.pk:
                     new_session.is_active = False
                 new_session.save()
-                request.session["grader_moderator_selected_session_id"] = new_session.pk
                 messages.success(request, "Grader session saved.")
-                return redirect("grader_moderator_dashboard")
+                return _set_selection_cookie(redirect("grader_moderator_dashboard"), _GRADER_SELECTION_COOKIE, new_session.pk)
             else:
                 messages.error(request, "Please fix the errors below.")
         elif action == "activate_session":
@@ -800,30 +1057,21 @@ def grader_moderator_dashboard(request: HttpRequest) -> HttpResponse:
                 messages.error(request, "Select a session before activating it.")
             else:
                 selected_session.activate()
-                request.session["grader_moderator_selected_session_id"] = selected_session.pk
                 messages.success(request, f"Grader session {selected_session.s_id} is now active.")
-                return redirect("grader_moderator_dashboard")
+                return _set_selection_cookie(redirect("grader_moderator_dashboard"), _GRADER_SELECTION_COOKIE, selected_session.pk)
         elif action == "run_rag":
             if selected_session is None:
                 messages.error(request, "Save or select a session before rebuilding the index.")
             else:
                 raw_text = None
+                csv_rows = None
                 uploaded = request.FILES.get('knowledge_file')
-                if uploaded is not None:
+                if uploaded is not None and _is_csv_upload(uploaded):
+                    # CSV rows are fed straight to the indexer without joining them first
+                    csv_rows = _iter_csv_upload(uploaded)
+                elif uploaded is not None:
                     try:
-                        content = uploaded.read()
-                        try:
-                            text = content.decode('utf-8')
-                        except Exception:
-                            text = content.decode('latin-1')
-                        name = (uploaded.name or '').lower()
-                        if name.endswith('.csv'):
-                            import csv, io
-                            reader = csv.reader(io.StringIO(text))
-                            rows = [', '.join([cell for cell in row]) for row in reader]
-                            raw_text = '\n'.join(rows)
-                        else:
-                            raw_text = text
+                        raw_text = _read_knowledge_upload(uploaded)
                     except Exception as exc:
                         messages.error(request, f"Failed to read uploaded file: {exc}")
                         return redirect("grader_moderator_dashboard")
@@ -831,7 +1079,11 @@ def grader_moderator_dashboard(request: HttpRequest) -> HttpResponse:
                     raw_text = request.POST.get('knowledge_base') or None
 
                 try:
-                    chunk_count = RagService(selected_session).build_index(raw_text=raw_text)
+                    rag_service = RagService(selected_session)
+                    if csv_rows is not None:
+                        chunk_count = rag_service.build_index_from_rows(csv_rows)
+                    else:
+                        chunk_count = rag_service.build_index(raw_text=raw_text)
                 except Exception as exc:
                     messages.error(request, f"Failed to rebuild the RAG index: {exc}")
                 else:
@@ -844,82 +1096,26 @@ def grader_moderator_dashboard(request: HttpRequest) -> HttpResponse:
             # Run analysis across all responses for the selected session
             if not selected_session:
                 messages.error(request, "Select a session before analyzing.")
+            elif selected_session.analysis_running and not request.POST.get("force_restart"):
+                messages.info(request, "An analysis is already running for this session.")
+                return redirect("grader_moderator_dashboard")
             else:
-                # Compute averages and call the LLM to summarize reasons per feature
-                from .services.openai_client import get_openai_client
-                client = get_openai_client()
-                responses = list(GraderResponse.objects.filter(session=selected_session))
-                questions = selected_session.get_question_sequence()
-                if not responses:
+                if not GraderResponse.objects.filter(session=selected_session).exists():
                     messages.warning(request, "No grader responses to analyze.")
                     return redirect("grader_moderator_dashboard")
 
-                # Compute average scores
-                scores_by_q = [[] for _ in questions]
-                comments_by_q = [[] for _ in questions]
-                for resp in responses:
-                    for i, q in enumerate(questions):
-                        try:
-                            score = int(resp.scores[i])
-                        except Exception:
-                            score = None
-                        if score is not None:
-                            scores_by_q[i].append(score)
-                        try:
-                            reason = str(resp.reasons[i]).strip()
-                        except Exception:
-                            reason = ""
-                        if reason:
-                            comments_by_q[i].append(reason)
-
-                averages = []
-                for lst in scores_by_q:
-                    if lst:
-                        averages.append(sum(lst) / len(lst))
-                    else:
-                        averages.append(None)
-
-                # Build prompts to summarize comments per question
-                summary_texts = []
-                for idx, q in enumerate(questions):
-                    concat = "\n\n".join(comments_by_q[idx])[:4000]
-                    system_prompt = f"You are summarizing grader feedback for a specific feature/question. Produce a concise markdown summary of the reasons provided by graders."
-                    user_prompt = f"Question: {q}\n\nResponses:\n{concat}\n\nProvide a short summary (3-6 sentences) capturing common themes and representative points."
-                    
-                    # Inject moderator's LLM instructions if provided
-                    if selected_session.user_instructions:
-                        user_prompt += f"\n\nModerator instructions: {selected_session.user_instructions}"
-                    
-                    messages_payload = [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ]
-                    try:
-                        completion = client.chat.completions.create(
-                            model=settings.OPENAI_MODEL_NAME,
-                            messages=messages_payload,
-                            temperature=0.6,
-                        )
-                        summary = completion.choices[0].message.content or ""
-                    except Exception as exc:
-                        summary = f"(LLM summary failed: {exc})"
-                    summary_texts.append(summary)
-
-                # Save analysis into session.moderator_summary (simple markdown)
-                md_lines = [f"# Analysis for {selected_session.topic}\n"]
-                for idx, q in enumerate(questions):
-                    avg = averages[idx]
-                    avg_str = f"{avg:.2f}" if avg is not None else "No scores"
-                    md_lines.append(f"## Question {idx+1}: {q}\n")
-                    md_lines.append(f"**Average score:** {avg_str}\n")
-                    md_lines.append(f"**Summary of reasons:**\n{summary_texts[idx]}\n")
-
-                selected_session.analysis_markdown = "\n".join(md_lines)
-                selected_session.save(update_fields=["analysis_markdown", "updated_at"])
-                messages.success(request, "Analysis complete. Summary available in the analysis panel.")
+                # The per-question LLM summaries run in the background so the request returns immediately
+                from .services.grader_analysis_service import GraderAnalysisService
+
+                try:
+                    GraderAnalysisService(selected_session).start_analysis(blocking=False)
+                except Exception as exc:
+                    messages.error(request, f"Error starting analysis: {exc}")
+                else:
+                    messages.success(request, "Analysis started. Refresh this page to see the summary once it finishes.")
                 return redirect("grader_moderator_dashboard")
 
-    if "session_form" not in locals():
+    if session_form is None:
         session_form = GraderSessionForm(instance=selected_session)
 
     selection_initial = {"session_id": str(selected_session.pk) if selected_session else ""}
@@ -936,27 +1132,29 @@ def grader_moderator_dashboard(request: HttpRequest) -> HttpResponse:
         "sessions": sessions,
         "deliberation_mode": "grader",
     }
-    return render(request, "core/grader_moderator_dashboard.html", context)
+    response = render(request, "core/grader_moderator_dashboard.html", context)
+    if selected_session is not None and selected_session.pk == query_pk:
+        _set_selection_cookie(response, _GRADER_SELECTION_COOKIE, query_pk)
+    return response
 
 
 def grader_user_view(request: HttpRequest, user_id: int) -> HttpResponse:
     """User-facing grader page where a participant assigns scores and reasons."""
-    from .models import GraderSession, GraderResponse
-    from .forms import GraderResponseForm
 
     session = GraderSession.get_active()
     if not session:
         messages.error(request, "No active grader session is available.")
         return redirect("system_choice")
 
-    questions = session.get_question_sequence()
+    questions = session.question_sequence
+    question_count = len(questions)
 
     # Build a simple dynamic form on the fly
     if request.method == "POST":
         # Extract the scores and reasons
         scores = []
         reasons = []
-        for i in range(len(questions)):
+        for i in range(question_count):
             s = request.POST.get(f"score_{i}")
             try:
                 sv = int(s)
@@ -967,28 +1165,42 @@ def grader_user_view(request: HttpRequest, user_id: int) -> HttpResponse:
 
         additional = request.POST.get("additional_comments", "")
 
-        # Save to DB (create or update if exists)
-        resp, _ = GraderResponse.objects.update_or_create(
-            session=session,
-            user_id=user_id,
-            defaults={
-                "scores": scores,
-                "reasons": reasons,
-                "additional_comments": additional,
-            },
+        # Save to DB in one INSERT ... ON CONFLICT statement (create or update if exists);
+        # submitted_at is left out of update_fields so it keeps the first submission time.
+        GraderResponse.objects.bulk_create(
+            [
+                GraderResponse(
+                    session=session,
+                    user_id=user_id,
+                    scores=scores,
+                    reasons=reasons,
+                    additional_comments=additional,
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=["session", "user_id"],
+            update_fields=["scores", "reasons", "additional_comments"],
         )
         messages.success(request, "Your grader responses have been saved. Thank you.")
         return redirect("system_choice")
 
-    # Pre-fill if response exists
-    existing = GraderResponse.objects.filter(session=session, user_id=user_id).first()
-    initial_scores = existing.scores if existing else [None] * len(questions)
-    initial_reasons = existing.reasons if existing else [""] * len(questions)
+    # Pre-fill if response exists; the (session, user_id) pair is unique, so skip
+    # the default ordering and load only the columns the form needs.
+    existing = (
+        GraderResponse.objects.filter(session=session, user_id=user_id)
+        .only("scores", "reasons", "additional_comments")
+        .order_by()
+        .first()
+    )
+    initial_scores = existing.scores if existing else [None] * question_count
+    initial_reasons = existing.reasons if existing else [""] * question_count
+    score_count = len(initial_scores)
+    reason_count = len(initial_reasons)
 
     # Build combined question data for template: (index, question, score, reason)
     questions_data = []
     for i, q in enumerate(questions):
-        questions_data.append((i, q, initial_scores[i] if i < len(initial_scores) else None, initial_reasons[i] if i < len(initial_reasons) else ""))
+        questions_data.append((i, q, initial_scores[i] if i < score_count else None, initial_reasons[i] if i < reason_count else ""))
 
     context = {
         "session": session,
@@ -1002,10 +1214,9 @@ def grader_user_view(request: HttpRequest, user_id: int) -> HttpResponse:
 
 def ai_deliberation_results(request: HttpRequest, run_id: int) -> HttpResponse:
     """Display the results of an AI deliberation run."""
-    from .models import AIDebateRun
 
     try:
-        run = AIDebateRun.objects.get(pk=run_id)
+        run = AIDebateRun.objects.select_related("session").get(pk=run_id)
     except AIDebateRun.DoesNotExist:
         messages.error(request, "Debate run not found.")
         return redirect("ai_moderator_dashboard")
@@ -1027,8 +1238,6 @@ def ai_deliberation_results(request: HttpRequest, run_id: int) -> HttpResponse:
 
                 if summary_text:
                     # Create or update summary record
-                    from .models import AIDebateSummary
-
                     summary_obj, _ = AIDebateSummary.objects.get_or_create(session=session)
                     summary_obj.topic = session.topic
                     summary_obj.description = session.description
@@ -1042,53 +1251,14 @@ def ai_deliberation_results(request: HttpRequest, run_id: int) -> HttpResponse:
             except Exception as exc:
                 messages.error(request, f"Error generating summary: {exc}")
 
-    # Format transcript for display in chat-like order per question
-    transcript_threads: list[dict[str, object]] = []
-    if run.transcript:
-        thread_lookup: Dict[int, dict[str, object]] = {}
-        question_order: List[int] = []
-
-        for turn in run.transcript:
-            q_idx = int(turn.get("question_index", 0))
-            question_text = turn.get("question", "")
-
-            if q_idx not in thread_lookup:
-                thread_lookup[q_idx] = {
-                    "question_index": q_idx,
-                    "question": question_text,
-                    "messages": [],
-                }
-                question_order.append(q_idx)
-
-            stage = turn.get("stage")
-            if not stage and "round" in turn:
-                round_value = turn.get("round")
-                if round_value == 1:
-                    stage = "initial"
-                elif round_value == 2:
-                    stage = "critique"
-
-            stage_label = None
-            if stage == "initial":
-                stage_label = "Initial Response"
-            elif stage == "critique":
-                stage_label = "Critique"
-
-            message = {
-                "persona": turn.get("persona", ""),
-                "content": turn.get("content") or turn.get("opinion", ""),
-                "stage": stage,
-                "stage_label": stage_label,
-                "peer_opinions": turn.get("peer_opinions", []),
-            }
-
-            thread_lookup[q_idx]["messages"].append(message)
+    # Runs finished before threaded_transcript existed are grouped on the fly
+    transcript_threads = run.threaded_transcript
+    if not transcript_threads and run.transcript:
+        from .services.ai_deliberation_service import build_transcript_threads
 
-        transcript_threads = [thread_lookup[idx] for idx in question_order]
+        transcript_threads = build_transcript_threads(run.transcript)
 
     # Get summary if it exists
-    from .models import AIDebateSummary
-
     summary_obj = AIDebateSummary.objects.filter(session=session).first()
 
     context = {
@@ -1100,22 +1270,71 @@ def ai_deliberation_results(request: HttpRequest, run_id: int) -> HttpResponse:
     return render(request, "core/ai_deliberation_results.html", context)
 
 
-def _get_or_create_default_ai_session() -> "AIDeliberationSession":
+def _get_or_create_default_ai_session() -> AIDeliberationSession:
     """Get or create a default AI deliberation session."""
-    from .models import AIDeliberationSession
 
-    session = AIDeliberationSession.objects.filter(is_active=True).order_by("-updated_at").first()
-    if not session:
-        session = AIDeliberationSession.objects.create(
-            s_id="ai-default",
-            topic="Default AI Deliberation",
-        )
-    return session
+    return AIDeliberationSession.get_active()
+
+
+# Rows serialized per chunk of a streamed CSV export
+_CSV_EXPORT_BATCH = 500
+
+
+def _csv_batches(header: List[Any], rows) -> Any:
+    """Yield CSV text in batches of ``_CSV_EXPORT_BATCH`` rows, starting with ``header``.
+
+    Each batch goes through a single ``writerows`` call so serialization stays
+    in the C csv module instead of one Python-level call per row.
+    """
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, _CSV_EXPORT_BATCH))
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        if len(batch) < _CSV_EXPORT_BATCH:
+            return
+        buffer.seek(0)
+        buffer.truncate()
+
+
+async def _aiter_in_thread(chunks) -> Any:
+    """Yield ``chunks`` from an async context, advancing the sync iterator in a worker thread.
+
+    Every step runs on the request's thread-sensitive executor, so the database
+    cursor behind a ``QuerySet.iterator()`` stays on the connection that opened it.
+    """
+
+    iterator = iter(chunks)
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    done = object()
+    try:
+        while (chunk := await next_chunk(iterator, done)) is not done:
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=True)()
+
+
+def _streaming_response(request: HttpRequest, chunks, content_type: str) -> StreamingHttpResponse:
+    """Return a ``StreamingHttpResponse`` that stays incremental under WSGI and ASGI.
+
+    Django's ASGI handler buffers a sync iterator in full before sending it, and
+    the WSGI handler does the same with an async one, so the iterator type has
+    to follow the handler that serves ``request``.
+    """
+
+    if isinstance(request, ASGIRequest):
+        chunks = _aiter_in_thread(chunks)
+    return StreamingHttpResponse(chunks, content_type=content_type)
 
 
 def grader_export_csv(request: HttpRequest, session_id: int) -> HttpResponse:
     """Export grader responses as CSV for a given session."""
-    from .models import GraderSession, GraderResponse
 
     try:
         session = GraderSession.objects.get(pk=session_id)
@@ -1123,12 +1342,13 @@ def grader_export_csv(request: HttpRequest, session_id: int) -> HttpResponse:
         messages.error(request, "Grader session not found.")
         return redirect("grader_moderator_dashboard")
 
-    questions = session.get_question_sequence()
-    responses = GraderResponse.objects.filter(session=session).order_by("user_id")
-
-    # Create CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
+    questions = session.question_sequence
+    question_count = len(questions)
+    responses = (
+        GraderResponse.objects.filter(session=session)
+        .order_by("user_id")
+        .values_list("user_id", "scores", "reasons", "additional_comments")
+    )
 
     # Header row: User ID, then each question's score and reason columns
     header = ["User ID"]
@@ -1136,21 +1356,24 @@ def grader_export_csv(request: HttpRequest, session_id: int) -> HttpResponse:
         header.append(f"Q{i+1} Score")
         header.append(f"Q{i+1} Reason")
     header.append("Additional Comments")
-    writer.writerow(header)
 
-    # Data rows
-    for resp in responses:
-        row = [resp.user_id]
-        for i, q in enumerate(questions):
-            score = resp.scores[i] if i < len(resp.scores) else ""
-            reason = resp.reasons[i] if i < len(resp.reasons) else ""
-            row.append(score)
-            row.append(reason)
-        row.append(resp.additional_comments or "")
-        writer.writerow(row)
-
-    # Return as file download
-    response = HttpResponse(output.getvalue(), content_type="text/csv")
+    # Rows start blank and scores/reasons are dropped into alternating columns with
+    # extended-slice assignment, so there is no per-cell bounds check.
+    blank_row = [""] * (2 * question_count + 2)
+
+    def rows():
+        for user_id, scores, reasons, additional_comments in responses.iterator(chunk_size=_CSV_EXPORT_BATCH):
+            scores = scores[:question_count]
+            reasons = reasons[:question_count]
+            row = blank_row.copy()
+            row[0] = user_id
+            row[1:2 * len(scores) + 1:2] = scores
+            row[2:2 * len(reasons) + 2:2] = reasons
+            row[-1] = additional_comments or ""
+            yield row
+
+    # Stream the file download in batches instead of building it in memory
+    response = _streaming_response(request, _csv_batches(header, rows()), "text/csv")
     response["Content-Disposition"] = f"attachment; filename=grader_{session.s_id}_{session.pk}.csv"
     return response
 
@@ -1175,55 +1398,108 @@ def discussion_grader_user_view(request: HttpRequest, user_id: int) -> HttpRespo
 # ============================================================================
 
 
+def _discussion_export_version(request: HttpRequest, session_id: int, user_id: Optional[int] = None):
+    """Return ``(last_modified, etag)`` for a discussion export, or ``(None, None)``.
+
+    Exports only change when the session or one of the exported conversations is
+    saved, so the newest ``updated_at`` plus the conversation count identifies
+    the content. The result is kept on the request because ``condition`` asks
+    for the ETag and Last-Modified separately.
+    """
+
+    cached = getattr(request, "_discussion_export_version", None)
+    if cached is not None:
+        return cached
+
+    conversation_filter = Q(conversations__user_id=user_id) if user_id is not None else None
+    row = (
+        DiscussionSession.objects.filter(pk=session_id)
+        .annotate(
+            latest_conversation=Max("conversations__updated_at", filter=conversation_filter),
+            conversation_count=Count("conversations", filter=conversation_filter),
+        )
+        .values_list("updated_at", "latest_conversation", "conversation_count")
+        .first()
+    )
+    if row is None or (user_id is not None and not row[2]):
+        # Let the view render its "not found" redirect without validators
+        cached = (None, None)
+    else:
+        session_updated, latest_conversation, conversation_count = row
+        last_modified = max(filter(None, (session_updated, latest_conversation)))
+        digest = hashlib.blake2b(
+            f"{session_id}:{user_id}:{last_modified.isoformat()}:{conversation_count}".encode("utf-8"),
+            digest_size=16,
+        )
+        cached = (last_modified, f'"{digest.hexdigest()}"')
+    request._discussion_export_version = cached
+    return cached
+
+
+# Conditional GET for the discussion exports: unchanged downloads answer 304
+_discussion_export_condition = condition(
+    etag_func=lambda request, *args, **kwargs: _discussion_export_version(request, *args, **kwargs)[1],
+    last_modified_func=lambda request, *args, **kwargs: _discussion_export_version(request, *args, **kwargs)[0],
+)
+
+
+@_discussion_export_condition
 def export_user_csv(request: HttpRequest, session_id: int, user_id: int) -> HttpResponse:
     """Export a single user's responses as CSV (question + response columns)."""
+    # One query for both rows; the session lookup only runs to pick the error message
     try:
-        session = DiscussionSession.objects.get(pk=session_id)
-    except DiscussionSession.DoesNotExist:
-        messages.error(request, "Session not found.")
-        return redirect("moderator_dashboard")
-
-    try:
-        conversation = UserConversation.objects.get(session=session, user_id=user_id)
+        conversation = UserConversation.objects.select_related("session").get(
+            session_id=session_id, user_id=user_id
+        )
     except UserConversation.DoesNotExist:
-        messages.error(request, f"No conversation found for user {user_id}.")
+        if not DiscussionSession.objects.filter(pk=session_id).exists():
+            messages.error(request, "Session not found.")
+        else:
+            messages.error(request, f"No conversation found for user {user_id}.")
         return redirect("moderator_dashboard")
+    session = conversation.session
 
     all_questions = session.get_all_questions()
     responses = conversation.get_all_responses()
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-
     # Header row
-    writer.writerow(["Question #", "Question Type", "Question Text", "Score", "Reason/Response", "Discussion Messages"])
-
-    # Build a lookup of responses by question index
-    response_lookup = {r.get("question_index"): r for r in responses}
-
-    for i, q in enumerate(all_questions):
-        resp = response_lookup.get(i, {})
-        q_text = q.get("text", "")
-        q_type = q.get("type", "discussion")
-
-        if q_type == "grading":
-            score = resp.get("score", "")
-            reason = resp.get("reason", "")
-            writer.writerow([i + 1, q_type.capitalize(), q_text, score, reason, ""])
-        else:
-            # For discussion questions, concatenate the history
-            history = resp.get("discussion_history", [])
-            if history:
-                history_text = " | ".join([f"{m.get('role', 'unknown')}: {m.get('content', '')}" for m in history])
+    header = ["Question #", "Question Type", "Question Text", "Score", "Reason/Response", "Discussion Messages"]
+
+    # Build a lookup of responses by question index, pre-filled so every question
+    # index resolves with a plain subscript (the shared empty dict is only read)
+    response_lookup: Dict[Any, Dict[str, Any]] = dict.fromkeys(range(len(all_questions)), {})
+    response_lookup.update({r.get("question_index"): r for r in responses})
+
+    def rows():
+        # Nothing answered yet: one marker row instead of a blank row per question
+        if not responses:
+            yield ["-", "-", "No responses", "", "", ""]
+            return
+
+        for i, q in enumerate(all_questions):
+            resp = response_lookup[i]
+            q_text = q.get("text", "")
+            q_type = q.get("type", "discussion")
+
+            if q_type == "grading":
+                score = resp.get("score", "")
+                reason = resp.get("reason", "")
+                yield [i + 1, q_type.capitalize(), q_text, score, reason, ""]
             else:
-                history_text = ""
-            writer.writerow([i + 1, q_type.capitalize(), q_text, "", "", history_text])
+                # For discussion questions, concatenate the history
+                history = resp.get("discussion_history", [])
+                if history:
+                    history_text = " | ".join([f"{m.get('role', 'unknown')}: {m.get('content', '')}" for m in history])
+                else:
+                    history_text = ""
+                yield [i + 1, q_type.capitalize(), q_text, "", "", history_text]
 
-    response = HttpResponse(output.getvalue(), content_type="text/csv")
+    response = _streaming_response(request, _csv_batches(header, rows()), "text/csv")
     response["Content-Disposition"] = f"attachment; filename=user_{user_id}_{session.s_id}_{session.pk}.csv"
     return response
 
 
+@_discussion_export_condition
 def export_ratings_csv(request: HttpRequest, session_id: int) -> HttpResponse:
     """Export overall grading ratings as CSV (users x questions matrix with averages)."""
     try:
@@ -1239,10 +1515,14 @@ def export_ratings_csv(request: HttpRequest, session_id: int) -> HttpResponse:
         messages.warning(request, "No grading questions found in this session.")
         return redirect("moderator_dashboard")
 
-    conversations = UserConversation.objects.filter(session=session).order_by("user_id")
-
-    output = io.StringIO()
-    writer = csv.writer(output)
+    # Responses are a JSON column, not a relation, so there is nothing to prefetch;
+    # read (user_id, responses) pairs directly instead of building model instances.
+    conversations = (
+        UserConversation.objects.filter(session=session)
+        .order_by("user_id")
+        .values_list("user_id", "responses")
+    )
+    grading_indices = tuple(q_idx for q_idx, _ in grading_questions)
 
     # Header row: User ID, Q1 Score, Q1 Reason, Q2 Score, Q2 Reason, ...
     header = ["User ID"]
@@ -1250,48 +1530,53 @@ def export_ratings_csv(request: HttpRequest, session_id: int) -> HttpResponse:
         q_num = idx + 1
         header.append(f"Q{q_num} Score")
         header.append(f"Q{q_num} Reason")
-    writer.writerow(header)
 
-    # Data rows for each user
-    all_scores: Dict[int, List[Optional[int]]] = {}  # question_index -> list of scores
-
-    for conv in conversations:
-        responses = conv.get_all_responses()
-        response_lookup = {r.get("question_index"): r for r in responses}
-
-        row = [conv.user_id]
-        for q_idx, q in grading_questions:
-            resp = response_lookup.get(q_idx, {})
-            score = resp.get("score")
-            reason = resp.get("reason", "")
-            row.append(score if score is not None else "")
-            row.append(reason)
-
-            # Track for averages
-            if q_idx not in all_scores:
-                all_scores[q_idx] = []
-            if score is not None:
-                all_scores[q_idx].append(score)
-
-        writer.writerow(row)
-
-    # Average row
-    avg_row: List[Any] = ["AVERAGE"]
-    for q_idx, q in grading_questions:
-        scores = all_scores.get(q_idx, [])
-        if scores:
-            avg = sum(scores) / len(scores)
-            avg_row.append(f"{avg:.2f}")
-        else:
-            avg_row.append("")
-        avg_row.append("")  # No average for reason column
-    writer.writerow(avg_row)
+    # Rows are copied from a pre-sized template and filled by column position.
+    # Each row needs its own list because _csv_batches buffers a batch of them.
+    blank_row = [""] * (1 + 2 * len(grading_indices))
+    empty_response: Dict[str, Any] = {}
+
+    def rows():
+        # Running per-question totals for the AVERAGE row; no per-user data is kept
+        score_totals: Dict[int, float] = dict.fromkeys(grading_indices, 0)
+        score_counts: Dict[int, int] = dict.fromkeys(grading_indices, 0)
+
+        # Data rows for each user
+        for user_id, responses in conversations.iterator(chunk_size=_CSV_EXPORT_BATCH):
+            response_lookup = {r.get("question_index"): r for r in responses or []}
+
+            row = blank_row.copy()
+            row[0] = user_id
+            for col, q_idx in enumerate(grading_indices, start=1):
+                resp = response_lookup.get(q_idx, empty_response)
+                score = resp.get("score")
+                row[2 * col] = resp.get("reason", "")
+
+                # Track for averages
+                if score is not None:
+                    row[2 * col - 1] = score
+                    score_totals[q_idx] += score
+                    score_counts[q_idx] += 1
+
+            yield row
+
+        # Average row
+        avg_row: List[Any] = ["AVERAGE"]
+        for q_idx in grading_indices:
+            if score_counts[q_idx]:
+                avg = score_totals[q_idx] / score_counts[q_idx]
+                avg_row.append(f"{avg:.2f}")
+            else:
+                avg_row.append("")
+            avg_row.append("")  # No average for reason column
+        yield avg_row
 
-    response = HttpResponse(output.getvalue(), content_type="text/csv")
+    response = _streaming_response(request, _csv_batches(header, rows()), "text/csv")
     response["Content-Disposition"] = f"attachment; filename=ratings_{session.s_id}_{session.pk}.csv"
     return response
 
 
+@_discussion_export_condition
 def download_summary_json(request: HttpRequest, session_id: int) -> HttpResponse:
     """Download the session summary as a JSON file."""
     try:
@@ -1301,20 +1586,24 @@ def download_summary_json(request: HttpRequest, session_id: int) -> HttpResponse
         return redirect("moderator_dashboard")
 
     all_questions = session.get_all_questions()
-    conversations = UserConversation.objects.filter(session=session).order_by("user_id")
+    # Only the exported columns are read, as plain tuples; history and scratchpad
+    # can be large and the users array needs no model instances.
+    conversations = (
+        UserConversation.objects.filter(session=session)
+        .order_by("user_id")
+        .values_list("user_id", "active", "message_count", "responses", "views_markdown")
+    )
 
-    # Build comprehensive summary
+    # Session metadata; "users" and "grading_statistics" are streamed after it
     summary: Dict[str, Any] = {
         "session_id": session.s_id,
         "session_pk": session.pk,
         "topic": session.topic,
         "description": session.description,
-        "created_at": session.created_at.isoformat() if session.created_at else None,
+        "created_at": session.created_at,
         "questions": all_questions,
         "moderator_summary": None,
         "moderator_temp": session.moderator_temp or None,
-        "users": [],
-        "grading_statistics": {},
     }
 
     # Parse moderator summary if available
@@ -1324,107 +1613,150 @@ def download_summary_json(request: HttpRequest, session_id: int) -> HttpResponse
         except json.JSONDecodeError:
             summary["moderator_summary"] = session.moderator_summary
 
-    # Collect user data
     grading_questions = [(i, q) for i, q in enumerate(all_questions) if q.get("type") == "grading"]
-    all_scores: Dict[int, List[int]] = {q_idx: [] for q_idx, _ in grading_questions}
-
-    for conv in conversations:
-        responses = conv.get_all_responses()
-        user_data: Dict[str, Any] = {
-            "user_id": conv.user_id,
-            "active": conv.active,
-            "message_count": conv.message_count,
-            "responses": responses,
-            "views_markdown": conv.views_markdown or None,
-        }
-        summary["users"].append(user_data)
-
-        # Collect grading scores for stats
-        response_lookup = {r.get("question_index"): r for r in responses}
-        for q_idx, _ in grading_questions:
-            resp = response_lookup.get(q_idx, {})
-            score = resp.get("score")
-            if score is not None:
-                all_scores[q_idx].append(score)
-
-    # Calculate grading statistics
-    for q_idx, scores in all_scores.items():
-        q_data = all_questions[q_idx] if q_idx < len(all_questions) else {}
-        stats: Dict[str, Any] = {
-            "question_index": q_idx,
-            "question_text": q_data.get("text", ""),
-            "response_count": len(scores),
-        }
-        if scores:
-            stats["average"] = sum(scores) / len(scores)
-            stats["min"] = min(scores)
-            stats["max"] = max(scores)
-        else:
-            stats["average"] = None
-            stats["min"] = None
-            stats["max"] = None
-        summary["grading_statistics"][f"q{q_idx + 1}"] = stats
-
-    response = HttpResponse(
-        json.dumps(summary, indent=2, ensure_ascii=False),
-        content_type="application/json",
-    )
-    response["Content-Disposition"] = f"attachment; filename=summary_{session.s_id}_{session.pk}.json"
-    return response
+    # Compact by default; ?pretty=1 indents each streamed fragment for reading
+    dump_option = orjson.OPT_NON_STR_KEYS
+    if request.GET.get("pretty"):
+        dump_option |= orjson.OPT_INDENT_2
+
+    def summary_chunks():
+        # The document is emitted piecewise so only one user record is held at a
+        # time: the metadata object is reopened to append the users array, and the
+        # statistics follow once every row has been seen.
+        yield orjson.dumps(summary, option=dump_option)[:-1] + b',"users":['
+
+        # Running [count, total, min, max] per grading question, folded in while
+        # the users are written instead of keeping every score around.
+        score_stats: Dict[int, List[Any]] = {q_idx: [0, 0, None, None] for q_idx, _ in grading_questions}
+
+        separator = b""
+        for user_id, active, message_count, raw_responses, views_markdown in conversations.iterator(
+            chunk_size=200
+        ):
+            # Same ordering as UserConversation.get_all_responses()
+            responses = sorted(raw_responses or [], key=lambda x: x.get("question_index", 0))
+            user_data: Dict[str, Any] = {
+                "user_id": user_id,
+                "active": active,
+                "message_count": message_count,
+                "responses": responses,
+                "views_markdown": views_markdown or None,
+            }
+            yield separator + orjson.dumps(user_data, option=dump_option)
+            separator = b","
+
+            # Collect grading scores for stats
+            response_lookup = {r.get("question_index"): r for r in responses}
+            for q_idx, _ in grading_questions:
+                resp = response_lookup.get(q_idx, {})
+                score = resp.get("score")
+                if score is not None:
+                    acc = score_stats[q_idx]
+                    acc[0] += 1
+                    acc[1] += score
+                    acc[2] = score if acc[2] is None else min(acc[2], score)
+                    acc[3] = score if acc[3] is None else max(acc[3], score)
+
+        # Calculate grading statistics
+        grading_statistics: Dict[str, Any] = {}
+        for q_idx, q_data in grading_questions:
+            count, total, low, high = score_stats[q_idx]
+            stats: Dict[str, Any] = {
+                "question_index": q_idx,
+                "question_text": q_data.get("text", ""),
+                "response_count": count,
+            }
+            if count:
+                stats["average"] = total / count
+                stats["min"] = low
+                stats["max"] = high
+            else:
+                stats["average"] = None
+                stats["min"] = None
+                stats["max"] = None
+            grading_statistics[f"q{q_idx + 1}"] = stats
 
+        yield b'],"grading_statistics":' + orjson.dumps(grading_statistics, option=dump_option) + b"}"
 
-def download_user_summary_markdown(request: HttpRequest, session_id: int, user_id: int) -> HttpResponse:
-    """Download an individual user's final analysis as a markdown file with metadata."""
-    try:
-        session = DiscussionSession.objects.get(pk=session_id)
-    except DiscussionSession.DoesNotExist:
-        messages.error(request, "Session not found.")
-        return redirect("moderator_dashboard")
+    response = _streaming_response(request, summary_chunks(), "application/json")
+    response["Content-Disposition"] = f"attachment; filename=summary_{session.s_id}_{session.pk}.json"
+    return response
 
-    try:
-        conversation = UserConversation.objects.get(session=session, user_id=user_id)
-    except UserConversation.DoesNotExist:
-        messages.error(request, f"No conversation found for user {user_id}.")
-        return redirect("moderator_dashboard")
 
-    # Build comprehensive markdown with metadata
-    markdown_content = f"""# User {user_id} - Final Analysis
-## Session: {session.topic}
-**Session ID:** {session.s_id}  
-**Date:** {conversation.updated_at.strftime('%Y-%m-%d %H:%M:%S') if conversation.updated_at else 'N/A'}
+# Per-user markdown export, filled with str.format_map around the concept list
+_USER_MD_HEADER = """# User {user_id} - Final Analysis
+## Session: {topic}
+**Session ID:** {s_id}  
+**Date:** {date}
 
 ---
 
 ## Metadata
 
-- **Total Messages:** {conversation.message_count}
-- **Content Length:** {conversation.content_length} words
-- **Termination Reason:** {conversation.termination_reason or 'N/A'}
-- **Unique Concepts Discussed:** {len(conversation.unique_concepts or [])}
+- **Total Messages:** {message_count}
+- **Content Length:** {content_length} words
+- **Termination Reason:** {termination_reason}
+- **Unique Concepts Discussed:** {concept_count}
 
 ### Key Concepts
 
 """
-    
-    # Add unique concepts as a list
-    if conversation.unique_concepts:
-        for concept in conversation.unique_concepts:
-            markdown_content += f"- {concept}\n"
-    else:
-        markdown_content += "*No concepts extracted*\n"
-    
-    markdown_content += f"""
+_USER_MD_FOOTER = """
 ---
 
 ## Analysis
 
-{conversation.views_markdown or '*No final analysis available*'}
+{analysis}
 
 ---
 
 *Generated by DiscussChat - AI-Facilitated Deliberation Platform*
 """
 
+
+@_discussion_export_condition
+def download_user_summary_markdown(request: HttpRequest, session_id: int, user_id: int) -> HttpResponse:
+    """Download an individual user's final analysis as a markdown file with metadata."""
+    # One query for both rows; the session lookup only runs to pick the error message
+    try:
+        conversation = UserConversation.objects.select_related("session").get(
+            session_id=session_id, user_id=user_id
+        )
+    except UserConversation.DoesNotExist:
+        if not DiscussionSession.objects.filter(pk=session_id).exists():
+            messages.error(request, "Session not found.")
+        else:
+            messages.error(request, f"No conversation found for user {user_id}.")
+        return redirect("moderator_dashboard")
+    session = conversation.session
+
+    concepts = conversation.unique_concepts or []
+
+    # Build comprehensive markdown with metadata, joined once at the end
+    parts: List[str] = [
+        _USER_MD_HEADER.format_map(
+            {
+                "user_id": user_id,
+                "topic": session.topic,
+                "s_id": session.s_id,
+                "date": conversation.updated_at.strftime('%Y-%m-%d %H:%M:%S') if conversation.updated_at else 'N/A',
+                "message_count": conversation.message_count,
+                "content_length": conversation.content_length,
+                "termination_reason": conversation.termination_reason or 'N/A',
+                "concept_count": len(concepts),
+            }
+        )
+    ]
+
+    # Add unique concepts as a list
+    if concepts:
+        parts.extend(f"- {concept}\n" for concept in concepts)
+    else:
+        parts.append("*No concepts extracted*\n")
+
+    parts.append(_USER_MD_FOOTER.format_map({"analysis": conversation.views_markdown or '*No final analysis available*'}))
+    markdown_content = "".join(parts)
+
     response = HttpResponse(markdown_content, content_type="text/markdown; charset=utf-8")
     response["Content-Disposition"] = f"attachment; filename=user_{user_id}_{session.s_id}_analysis.md"
     return response
@@ -14,4 +14,6 @@ __all__ = [
     "USER_BOT_OUTPUT_INSTRUCTIONS",
     "USER_BOT_FINAL_PROMPT",
     "MODERATOR_ANALYSIS_PROMPT",
+    "QUESTION_GENERATOR_DISCUSSION_PROMPT",
+    "QUESTION_GENERATOR_GRADER_PROMPT",
 ]
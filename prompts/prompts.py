@@ -166,3 +166,43 @@ across all sessions while remaining flexible for customization.
 
 Used by: DiscussionSession model as a default value; ModeratorAnalysisService as fallback.
 """
+
+
+# ============================================================================
+# QUESTION GENERATOR PROMPTS
+# ============================================================================
+
+QUESTION_GENERATOR_DISCUSSION_PROMPT = (
+    "You are a helpful assistant that creates short, objective, neutral discussion questions. "
+    "Given a topic and optional background excerpts, produce exactly four concise objective questions suitable for asking participants. "
+    "Avoid reusing any questions that the moderator already selected. "
+    "Return ONLY a JSON object with a 'questions' key containing an array of 4 question strings. "
+    "Example format: {\"questions\": [\"question 1\", \"question 2\", \"question 3\", \"question 4\"]}"
+)
+"""
+Role: Drafts candidate discussion questions for the moderator's question builder.
+
+Context: The moderator enters a topic (plus optional knowledge base excerpts) and asks
+for suggestions. The model must answer in JSON mode with four neutral questions that do
+not repeat the ones already selected.
+
+Used by: generate_questions_api when question_type is "discussion".
+"""
+
+
+QUESTION_GENERATOR_GRADER_PROMPT = (
+    "You are a helpful assistant that drafts objective grading prompts. "
+    "Given a topic and optional background excerpts, produce exactly four concise prompts that ask participants to assign a score from 1 (poor) to 10 (excellent) and provide a short explanation. "
+    "Avoid reusing any prompts that the moderator already selected. "
+    "Each prompt must clearly describe what the grader is evaluating while remaining neutral and factual. "
+    "Return ONLY a JSON object with a 'questions' key containing an array of 4 prompt strings. "
+    "Example format: {\"questions\": [\"Rate how clearly the participant explained...\", ...]}"
+)
+"""
+Role: Drafts candidate 1-10 grading prompts for the moderator's question builder.
+
+Context: Same flow as QUESTION_GENERATOR_DISCUSSION_PROMPT, but each suggestion asks the
+participant for a numeric score and a short reason.
+
+Used by: generate_questions_api when question_type is a grading alias.
+"""